@@ -1,3 +1,4 @@
+import functools
 import os
 
 from pydantic_ai import Agent
@@ -7,11 +8,25 @@ from agent.prompt import get_system_prompt
 from agent.tools.query_data import query_data
 from agent.tools.visualize import visualize
 
+MODEL = os.getenv("MODEL", "mistral:magistral-small-latest")
+
 
 def create_agent(dataset_info: str) -> Agent[AgentContext, str]:
-    """Create the data analysis agent with query and visualization tools."""
-    model = os.getenv("MODEL", "mistral:magistral-small-latest")
+    """Create the data analysis agent with query and visualization tools.
+
+    Agents are memoized on (model, dataset_info): a dataset schema change
+    produces a different dataset_info string, hence a fresh agent.
+    """
+    return _build_agent(MODEL, dataset_info)
+
+
+def clear_agent_cache() -> None:
+    """Drop memoized agents, e.g. after a reload that changes the model or tools."""
+    _build_agent.cache_clear()
+
 
+@functools.lru_cache(maxsize=4)
+def _build_agent(model: str, dataset_info: str) -> Agent[AgentContext, str]:
     agent: Agent[AgentContext, str] = Agent(
         model=model,
         deps_type=AgentContext,
@@ -1,14 +1,49 @@
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Mapping, Optional
 
+import duckdb
 import pandas as pd
+import pyarrow as pa
 
 
 @dataclass
 class AgentContext:
     """Context injected into all agent tools via PydanticAI dependency injection."""
 
-    datasets: dict[str, pd.DataFrame] = field(default_factory=dict)
+    # Shared read-only view across requests: never mutate in place
+    datasets: Mapping[str, pd.DataFrame | duckdb.DuckDBPyRelation] = field(default_factory=dict)
     dataset_info: str = ""
-    current_dataframe: Optional[pd.DataFrame] = None
     email: str = ""
+
+    # Last query result, kept as Arrow until a tool needs a pandas DataFrame
+    current_arrow: Optional[pa.Table] = field(default=None, init=False, repr=False)
+    _dataframe_cache: Optional[tuple[pa.Table, pd.DataFrame]] = field(
+        default=None, init=False, repr=False
+    )
+
+    # DuckDB connection reused across query_data calls (created lazily)
+    duckdb_conn: Optional[duckdb.DuckDBPyConnection] = field(
+        default=None, init=False, repr=False
+    )
+    _registered_tables: set[str] = field(default_factory=set, init=False, repr=False)
+    # Arrow results of previous queries on this context, keyed by SQL text
+    _query_cache: dict[str, pa.Table] = field(default_factory=dict, init=False, repr=False)
+
+    def close(self) -> None:
+        """Release per-request resources: DuckDB connection and cached results."""
+        if self.duckdb_conn is not None:
+            self.duckdb_conn.close()
+            self.duckdb_conn = None
+        self._registered_tables.clear()
+        self._query_cache.clear()
+        self.current_arrow = None
+        self._dataframe_cache = None
+
+    @property
+    def current_dataframe(self) -> Optional[pd.DataFrame]:
+        """Last query result as pandas, converted from Arrow on first access."""
+        if self.current_arrow is None:
+            return None
+        if self._dataframe_cache is None or self._dataframe_cache[0] is not self.current_arrow:
+            self._dataframe_cache = (self.current_arrow, self.current_arrow.to_pandas())
+        return self._dataframe_cache[1]
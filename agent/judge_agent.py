@@ -1,10 +1,13 @@
 """Agent judge pour évaluer le besoin de visualisation."""
 
+import functools
 import os
 
 from pydantic import BaseModel, Field
 from pydantic_ai import Agent
 
+MODEL = os.getenv("MODEL", "mistral:magistral-small-latest")
+
 
 class AgentJudgment(BaseModel):
     """Jugement post-run sur la nécessité d'une visualisation."""
@@ -19,8 +22,12 @@ class AgentJudgment(BaseModel):
 
 def create_judge_agent() -> Agent:
     """Crée l'agent judge qui évalue si une visualisation était nécessaire."""
-    model = os.getenv("MODEL", "mistral:magistral-small-latest")
+    return _build_judge_agent(MODEL)
+
 
+@functools.lru_cache(maxsize=1)
+def _build_judge_agent(model: str) -> Agent:
+    """Construit l'agent judge (mémoïsé : il ne dépend que du modèle)."""
     return Agent(
         model,
         output_type=AgentJudgment,
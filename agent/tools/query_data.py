@@ -1,32 +1,134 @@
+import asyncio
+import re
 from pathlib import Path
 
 import duckdb
-import pandas as pd
+import pyarrow as pa
 from pydantic_ai import ModelRetry, RunContext
 
 from agent.context import AgentContext
 
 DATA_DIR = Path("data")
+PREVIEW_ROWS = 5
+PREVIEW_MAX_COLS = 20
+QUERY_CACHE_SIZE = 32
+# Functions/clauses whose result changes between runs: never served from cache
+_VOLATILE_RE = re.compile(
+    r"\b(random|uuid|gen_random_uuid|now|current_(date|time|timestamp)|get_current_time)\b"
+    r"|\b(using\s+sample|tablesample)\b",
+    re.IGNORECASE,
+)
+
+
+def _get_connection(ctx: RunContext[AgentContext]) -> duckdb.DuckDBPyConnection:
+    """Return the cached DuckDB connection, registering datasets not yet known to it."""
+    if ctx.deps.duckdb_conn is None:
+        ctx.deps.duckdb_conn = duckdb.connect(database=":memory:")
+
+    conn = ctx.deps.duckdb_conn
+    pending = ctx.deps.datasets.keys() - ctx.deps._registered_tables
+    if pending:
+        # One transaction for the whole batch instead of one catalog commit per dataset
+        conn.begin()
+        try:
+            for name in pending:
+                conn.register(name, ctx.deps.datasets[name])
+        except Exception:
+            conn.rollback()
+            raise
+        conn.commit()
+        ctx.deps._registered_tables.update(pending)
+        ctx.deps._query_cache.clear()
+    return conn
+
+
+def _is_cacheable(conn: duckdb.DuckDBPyConnection, sql: str) -> tuple[bool, bool]:
+    """Return (cacheable, read_only) for sql, as classified by DuckDB's parser.
+
+    Only a single deterministic SELECT is cacheable; any non-SELECT statement
+    (DDL, INSERT, ...) may change what later queries see.
+    """
+    try:
+        statements = conn.extract_statements(sql)
+    except duckdb.Error:
+        return False, True  # Invalid SQL: execute() reports the error, nothing changes
+
+    read_only = all(stmt.type == duckdb.StatementType.SELECT for stmt in statements)
+    cacheable = read_only and len(statements) == 1 and not _VOLATILE_RE.search(sql)
+    return cacheable, read_only
 
 
-def _load_csv_datasets(ctx: RunContext[AgentContext]) -> None:
-    """Load CSV files from data/ into context datasets if not already loaded."""
+def _execute(ctx: RunContext[AgentContext], sql: str) -> pa.Table:
+    """Run sql, reusing the Arrow result of an identical earlier SELECT on this context.
+
+    A repeated deterministic SELECT (typically re-issued during a visualization
+    retry) skips DuckDB entirely. Any other statement clears the cache, since
+    it may have changed the tables those results came from.
+    """
+    conn = _get_connection(ctx)  # registers new datasets, clearing stale results
+
+    key = sql.strip()
+    cache = ctx.deps._query_cache
+    cacheable, read_only = _is_cacheable(conn, sql)
+    if not read_only:
+        cache.clear()
+    elif cacheable and key in cache:
+        return cache[key]
+
+    arrow_table = conn.execute(sql).fetch_arrow_table()
+    if cacheable:
+        if len(cache) >= QUERY_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = arrow_table
+    return arrow_table
+
+
+def _describe_dataset(cursor: duckdb.DuckDBPyConnection, table_name: str) -> str:
+    """Build the dataset_info line for one view (runs in a worker thread)."""
+    with cursor:
+        columns = cursor.execute(f'DESCRIBE "{table_name}"').fetchall()
+        (row_count,) = cursor.execute(f'SELECT count(*) FROM "{table_name}"').fetchone()
+    cols = ", ".join(f"{col[0]} ({col[1]})" for col in columns)
+    return f"- **{table_name}**: {row_count} rows, columns: {cols}"
+
+
+async def _load_csv_datasets(ctx: RunContext[AgentContext]) -> None:
+    """Expose CSV files from data/ as DuckDB views if no dataset is loaded yet.
+
+    DuckDB parses the files itself (read_csv_auto), so filters and projections
+    are pushed down into the scan instead of materializing pandas frames.
+    """
     if ctx.deps.datasets:
         return
 
     if not DATA_DIR.exists():
         return
 
-    for csv_file in sorted(DATA_DIR.glob("*.csv")):
+    if ctx.deps.duckdb_conn is None:
+        ctx.deps.duckdb_conn = duckdb.connect(database=":memory:")
+    conn = ctx.deps.duckdb_conn
+
+    files = sorted(DATA_DIR.glob("*.csv"))
+    datasets = {}
+    for csv_file in files:
         table_name = csv_file.stem
-        ctx.deps.datasets[table_name] = pd.read_csv(csv_file)
+        # Views cannot hold prepared parameters: inline the path as an escaped literal
+        path_literal = str(csv_file).replace("'", "''")
+        conn.execute(
+            f'CREATE OR REPLACE VIEW "{table_name}" AS '
+            f"SELECT * FROM read_csv_auto('{path_literal}')"
+        )
+        ctx.deps._registered_tables.add(table_name)
+        datasets[table_name] = conn.view(table_name)
 
-    if ctx.deps.datasets:
-        # Build dataset_info for the system prompt context
-        info_parts = []
-        for name, df in ctx.deps.datasets.items():
-            cols = ", ".join(f"{c} ({df[c].dtype})" for c in df.columns)
-            info_parts.append(f"- **{name}**: {df.shape[0]} rows, columns: {cols}")
+    ctx.deps.datasets = datasets
+
+    # Build dataset_info for the system prompt context. Describing a view scans
+    # its CSV, so files are probed concurrently, one DuckDB cursor per thread.
+    info_parts = await asyncio.gather(
+        *(asyncio.to_thread(_describe_dataset, conn.cursor(), f.stem) for f in files)
+    )
+    if info_parts:
         ctx.deps.dataset_info = "\n".join(info_parts)
 
 
@@ -42,24 +144,27 @@ async def query_data(
         sql: SQL query to execute. Table names correspond to dataset names.
         description: Short description of what this query does.
     """
-    _load_csv_datasets(ctx)
+    await _load_csv_datasets(ctx)
 
     if not ctx.deps.datasets:
         raise ModelRetry("No datasets loaded. Place CSV files in the data/ directory.")
 
     try:
-        with duckdb.connect(database=":memory:") as conn:
-            for name, df in ctx.deps.datasets.items():
-                conn.register(name, df)
-            result_df = conn.execute(sql).fetchdf()
+        arrow_table = _execute(ctx, sql)
 
-        ctx.deps.current_dataframe = result_df
+        # Keep the result as Arrow: visualize converts it to pandas only if called
+        ctx.deps.current_arrow = arrow_table
 
-        preview = result_df.head(5).to_string(index=False)
+        # Only the preview slice is formatted, with a column cap for wide results
+        preview = (
+            arrow_table.slice(0, PREVIEW_ROWS)
+            .to_pandas()
+            .to_string(index=False, max_cols=PREVIEW_MAX_COLS)
+        )
         summary = (
             f"Query executed successfully.\n"
-            f"Result: {result_df.shape[0]} rows x {result_df.shape[1]} columns\n"
-            f"Columns: {', '.join(result_df.columns.tolist())}\n"
+            f"Result: {arrow_table.num_rows} rows x {arrow_table.num_columns} columns\n"
+            f"Columns: {', '.join(arrow_table.column_names)}\n"
             f"Preview:\n{preview}"
         )
         return summary
@@ -1,14 +1,77 @@
-import os
+import functools
 import re
+import types
+from pathlib import Path
 from typing import Literal
 
 import pandas as pd
 import plotly.express as px
+import pyarrow as pa
+import pyarrow.csv as pacsv
 import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs_version
 from pydantic_ai import ModelRetry, RunContext
 
 from agent.context import AgentContext
 
+# Standalone page around an already-serialized figure (plotly.js from CDN)
+_HTML_TEMPLATE = """<html>
+<head><meta charset="utf-8" /></head>
+<body>
+<div id="figure" style="height:100%; width:100%;"></div>
+<script src="https://cdn.plot.ly/plotly-{version}.min.js"></script>
+<script>
+const figure = {figure};
+Plotly.newPlot("figure", {{
+  data: figure.data,
+  layout: figure.layout || {{}},
+  frames: figure.frames || [],
+  config: {{"responsive": true}},
+}});
+</script>
+</body>
+</html>
+"""
+_PLOTLYJS_VERSION = get_plotlyjs_version()
+
+_OUTPUT_DIR = Path("output")
+
+# Characters stripped from titles to build file names: translate table for
+# ASCII titles, regex (Unicode-aware \w) for the rest
+_SAFE_TITLE_RE = re.compile(r"[^\w\s-]")
+_SAFE_TITLE_DROP = {i: None for i in range(128) if _SAFE_TITLE_RE.match(chr(i))}
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_viz(code: str) -> types.CodeType:
+    """Compile visualization code once; identical snippets (judge retries) hit the cache."""
+    return compile(code, "<viz>", "exec")
+
+
+def _output_path(filename: str) -> Path:
+    """Path of filename in the output directory, created on first write (not at import)."""
+    _OUTPUT_DIR.mkdir(exist_ok=True)
+    return _OUTPUT_DIR / filename
+
+
+def _safe_title(title: str) -> str:
+    """Turn a visualization title into a file name stem."""
+    if title.isascii():
+        cleaned = title.translate(_SAFE_TITLE_DROP)
+    else:
+        cleaned = _SAFE_TITLE_RE.sub("", title)
+    return cleaned.strip().replace(" ", "_").lower()
+
+
+def _write_csv(df: pd.DataFrame, filepath: Path) -> None:
+    """Write df with pyarrow's C++ CSV writer, falling back to pandas for unconvertible columns."""
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        df.to_csv(filepath, index=False)
+        return
+    pacsv.write_csv(table, str(filepath))
+
 
 async def visualize(
     ctx: RunContext[AgentContext],
@@ -29,33 +92,40 @@ async def visualize(
         result_type: Either "figure" (Plotly chart) or "table" (formatted DataFrame).
         description: Description of what this visualization shows.
     """
-    if ctx.deps.current_dataframe is None:
+    if ctx.deps.current_arrow is None:
         raise ModelRetry("No data available. Call query_data first to load data.")
 
     df = ctx.deps.current_dataframe
 
     try:
         namespace = {
-            "df": df.copy(),
+            # Shallow copy: under copy-on-write (pandas >= 3) an in-place write
+            # in the snippet copies the block instead of mutating the context
+            "df": df.copy(deep=False),
             "pd": pd,
             "px": px,
             "go": go,
         }
-        exec(code, namespace)
+        exec(_compile_viz(code.rstrip()), namespace)
 
-        safe_title = re.sub(r"[^\w\s-]", "", title).strip().replace(" ", "_").lower()
-        os.makedirs("output", exist_ok=True)
+        safe_title = _safe_title(title)
 
         if result_type == "figure":
             fig = namespace.get("fig")
             if fig is None:
                 raise ModelRetry("Code must create a 'fig' variable (plotly Figure). Fix the code.")
 
-            filepath = f"output/{safe_title}.html"
-            fig.write_html(filepath)
-
+            # Serialize once: the same JSON feeds the HTML file and the tool result
             fig_json = fig.to_json()
 
+            filepath = _output_path(f"{safe_title}.html")
+            html = _HTML_TEMPLATE.format(
+                version=_PLOTLYJS_VERSION,
+                figure=fig_json.replace("</", "<\\/"),
+            )
+            with open(filepath, "w", encoding="utf-8") as f:
+                f.write(html)
+
             return (
                 f"Figure created: {title}\n"
                 f"Saved to: {filepath}\n"
@@ -67,8 +137,8 @@ async def visualize(
         elif result_type == "table":
             result = namespace.get("result", df)
 
-            filepath = f"output/{safe_title}.csv"
-            result.to_csv(filepath, index=False)
+            filepath = _output_path(f"{safe_title}.csv")
+            _write_csv(result, filepath)
 
             table_json = result.head(100).to_json(orient="split")
 
@@ -29,8 +29,13 @@ class EventBrokerPort(ABC):
         ...
 
     @abstractmethod
-    async def publish(self, channel: str, message: str) -> None:
-        """Publie un message sur un canal."""
+    async def publish(self, channel: str, message: str | bytes, wait: bool = False) -> None:
+        """
+        Publie un message sur un canal.
+
+        Par defaut fire-and-forget : le message est mis en file et envoye
+        par lot. wait=True publie immediatement et attend l'acquittement.
+        """
         ...
 
     @abstractmethod
@@ -43,6 +48,8 @@ class EventBrokerPort(ABC):
         """
         Publie un signal de cancellation via Pub/Sub.
 
+        Non bloquant : l'envoi peut etre differe apres le retour.
+
         Args:
             email: Email de l'utilisateur
         """
@@ -1,10 +1,16 @@
 """Adapter Redis pour le broker d'evenements via la lib broadcaster."""
+import asyncio
+import logging
 from contextlib import asynccontextmanager
+from typing import Optional
 
+import redis.asyncio as redis
 from broadcaster import Broadcast
 
 from backend.domain.ports.event_broker_port import EventBrokerPort
 
+logger = logging.getLogger(__name__)
+
 
 class BroadcastEventBroker(EventBrokerPort):
     """
@@ -12,22 +18,45 @@ class BroadcastEventBroker(EventBrokerPort):
 
     Wrappe l'instance Broadcast pour respecter l'interface abstraite
     et masquer les details de la lib (event.message, etc.).
+    Les publications passent par un _PublishBatcher (pipeline Redis) et
+    les canaux outbox:* par un _OutboxRouter (un seul abonnement Redis).
     """
 
-    def __init__(self, url: str):
+    def __init__(self, url: str, max_connections: Optional[int] = None):
+        self._url = url
+        self._max_connections = max_connections
+        self._redis: Optional[redis.Redis] = None
         self._broadcast = Broadcast(url)
+        self._batcher = _PublishBatcher()
+        self._outbox = _OutboxRouter()
 
     async def connect(self) -> None:
+        self._redis = redis.from_url(self._url, max_connections=self._max_connections)
         await self._broadcast.connect()
+        await self._batcher.start(self._redis)
+        await self._outbox.start(self._redis)
 
     async def disconnect(self) -> None:
+        await self._outbox.stop()
+        await self._batcher.stop()
         await self._broadcast.disconnect()
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
 
-    async def publish(self, channel: str, message: str) -> None:
-        await self._broadcast.publish(channel=channel, message=message)
+    async def publish(self, channel: str, message: str | bytes, wait: bool = False) -> None:
+        if wait:
+            await self._batcher.publish_now(channel, message)
+        else:
+            self._batcher.enqueue(channel, message)
 
     @asynccontextmanager
     async def subscribe(self, channel: str):
+        if channel.startswith(_OutboxRouter.PREFIX):
+            async with self._outbox.subscribe(channel) as subscription:
+                yield subscription
+            return
+
         async with self._broadcast.subscribe(channel=channel) as subscriber:
             yield _BroadcastSubscription(subscriber)
 
@@ -37,11 +66,173 @@ class BroadcastEventBroker(EventBrokerPort):
         """
         Publie un signal de cancellation via Redis Pub/Sub.
 
+        Fire-and-forget : le signal part avec le prochain batch du
+        _PublishBatcher, la route repond sans attendre l'ack Redis.
+
         Args:
             email: Email de l'utilisateur
         """
-        channel = f"cancel:{email}"
-        await self._broadcast.publish(channel=channel, message="cancel")
+        self._batcher.enqueue(f"cancel:{email}", "cancel")
+
+
+class _PublishBatcher:
+    """
+    Regroupe les PUBLISH en un seul aller-retour Redis (pipeline).
+
+    enqueue() rend la main immediatement ; une tache de fond attend
+    MAX_DELAY apres le premier message, draine jusqu'a MAX_BATCH messages
+    et les envoie dans un pipeline non transactionnel.
+    """
+
+    MAX_BATCH = 64
+    MAX_DELAY = 0.005  # secondes
+
+    def __init__(self):
+        self._redis: Optional[redis.Redis] = None
+        self._queue: asyncio.Queue[tuple[str, str | bytes]] = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, client: redis.Redis) -> None:
+        self._redis = client
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Envoie les messages en attente puis arrete la tache de fond."""
+        if self._task:
+            await self._queue.join()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def enqueue(self, channel: str, message: str | bytes) -> None:
+        self._queue.put_nowait((channel, message))
+
+    async def publish_now(self, channel: str, message: str | bytes) -> None:
+        """Publie sans batching et attend l'acquittement Redis."""
+        await self._redis.publish(channel, message)
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            await asyncio.sleep(self.MAX_DELAY)
+            while len(batch) < self.MAX_BATCH and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for channel, message in batch:
+                        pipe.publish(channel, message)
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Echec de publication de {len(batch)} message(s): {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+class _OutboxRouter:
+    """
+    Fan-out local des canaux outbox:*.
+
+    Un seul PSUBSCRIBE outbox:* par process (au lieu d'un SUBSCRIBE par
+    connexion SSE) ; chaque message recu est route vers les queues locales
+    des clients abonnes a ce canal.
+
+    Les queues sont bornees (QUEUE_SIZE) : pour un client trop lent, le
+    message le plus ancien est jete. Le message final (done) n'est jamais
+    perdu puisqu'il est toujours le dernier insere.
+    """
+
+    PREFIX = "outbox:"
+    PATTERN = "outbox:*"
+    RECONNECT_DELAY = 1.0  # secondes
+    QUEUE_SIZE = 1000
+
+    def __init__(self):
+        self._pubsub: Optional[redis.client.PubSub] = None
+        self._queues: dict[str, set[asyncio.Queue[str]]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.dropped_total = 0
+
+    async def start(self, client: redis.Redis) -> None:
+        self._pubsub = client.pubsub()
+        await self._pubsub.psubscribe(self.PATTERN)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._pubsub:
+            try:
+                await self._pubsub.punsubscribe()
+                await self._pubsub.close()
+            except Exception:
+                pass
+            self._pubsub = None
+
+    @asynccontextmanager
+    async def subscribe(self, channel: str):
+        queue: asyncio.Queue[str] = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        self._queues.setdefault(channel, set()).add(queue)
+        try:
+            yield _QueueSubscription(queue)
+        finally:
+            subscribers = self._queues.get(channel)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._queues[channel]
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async for raw_message in self._pubsub.listen():
+                    if raw_message["type"] != "pmessage":
+                        continue
+                    channel = raw_message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8")
+                    subscribers = self._queues.get(channel)
+                    if not subscribers:
+                        continue
+                    data = raw_message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode("utf-8")
+                    for queue in subscribers:
+                        self._deliver(channel, queue, data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Erreur dans le routeur outbox: {e}")
+                await asyncio.sleep(self.RECONNECT_DELAY)
+
+    def _deliver(self, channel: str, queue: asyncio.Queue[str], data: str) -> None:
+        """Ajoute le message, en jetant le plus ancien si le client est en retard."""
+        try:
+            queue.put_nowait(data)
+        except asyncio.QueueFull:
+            queue.get_nowait()
+            queue.put_nowait(data)
+            self.dropped_total += 1
+            logger.warning(f"Client lent sur {channel}: message ancien jete ({self.dropped_total} au total)")
+
+
+class _QueueSubscription:
+    """Abonnement local alimente par le _OutboxRouter."""
+
+    def __init__(self, queue: asyncio.Queue[str]):
+        self._queue = queue
+
+    async def get(self) -> str:
+        return await self._queue.get()
 
 
 class _BroadcastSubscription:
@@ -20,16 +20,9 @@ class Container(containers.DeclarativeContainer):
 
     Usage Tests (override sans modifier le code):
         with container.event_broker.override(mock_broker):
-            # Les routes utilisent le mock
+            # Le lifespan resout le mock et le place dans app.state
     """
 
-    wiring_config = containers.WiringConfiguration(
-        modules=[
-            "backend.routes.chat",
-            "backend.routes.stream",
-        ]
-    )
-
     # =========================================================================
     # EVENT BROKER
     # =========================================================================
@@ -37,5 +30,6 @@ class Container(containers.DeclarativeContainer):
     event_broker = providers.Singleton(
         BroadcastEventBroker,
         url=settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
     )
     """Broker d'evenements (Singleton). Connexion Redis partagee."""
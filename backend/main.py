@@ -7,9 +7,9 @@ Usage:
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
 
 from .infrastructure.container import Container
+from .middleware import WildcardCORSMiddleware
 from .routes import chat_router, stream_router
 
 container = Container()
@@ -20,6 +20,8 @@ async def lifespan(app: FastAPI):
     """Gestion du cycle de vie de l'application."""
     broker = container.event_broker()
     await broker.connect()
+    # Resolu une fois ici : les routes le lisent via app.state
+    app.state.event_broker = broker
     yield
     await broker.disconnect()
 
@@ -31,13 +33,7 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+app.add_middleware(WildcardCORSMiddleware)
 
 app.include_router(chat_router, prefix="/api", tags=["chat"])
 app.include_router(stream_router, prefix="/api", tags=["stream"])
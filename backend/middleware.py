@@ -0,0 +1,55 @@
+"""Middlewares ASGI du backend."""
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Headers CORS statiques (origines "*", sans credentials)
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+]
+PREFLIGHT_HEADERS = CORS_HEADERS + [
+    (b"access-control-allow-methods", b"DELETE, GET, HEAD, OPTIONS, PATCH, POST, PUT"),
+    (b"access-control-max-age", b"600"),
+]
+
+
+class WildcardCORSMiddleware:
+    """
+    CORS specialise pour allow_origins=["*"].
+
+    Ajoute Access-Control-Allow-Origin: * a chaque reponse et repond
+    directement 204 aux preflights, sans matching d'origine ni de methode.
+    Les credentials ne sont pas autorises (incompatibles avec "*").
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        if b"origin" not in headers:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] == "OPTIONS" and b"access-control-request-method" in headers:
+            await self._preflight(headers, send)
+            return
+
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", ())) + CORS_HEADERS
+            await send(message)
+
+        await self.app(scope, receive, send_with_cors)
+
+    @staticmethod
+    async def _preflight(headers: dict[bytes, bytes], send: Send) -> None:
+        response_headers = PREFLIGHT_HEADERS
+        requested = headers.get(b"access-control-request-headers")
+        if requested:
+            response_headers = response_headers + [(b"access-control-allow-headers", requested)]
+
+        await send({"type": "http.response.start", "status": 204, "headers": response_headers})
+        await send({"type": "http.response.body", "body": b""})
@@ -1,21 +1,18 @@
 """Route POST /chat - Envoi de messages utilisateur."""
-import json
-
+import orjson
 from fastapi import APIRouter, Depends, HTTPException
-from dependency_injector.wiring import inject, Provide
 
 from backend.domain.models.chat import ChatRequest, ChatResponse, CancelResponse
 from backend.domain.ports.event_broker_port import EventBrokerPort
-from backend.infrastructure.container import Container
+from backend.routes.dependencies import get_event_broker
 
 router = APIRouter()
 
 
 @router.post("/chat", response_model=ChatResponse)
-@inject
 async def send_message(
     request: ChatRequest,
-    broker: EventBrokerPort = Depends(Provide[Container.event_broker]),
+    broker: EventBrokerPort = Depends(get_event_broker),
 ):
     """
     Envoie un message utilisateur vers l'agent.
@@ -28,7 +25,7 @@ async def send_message(
 
     channel = f"inbox:{request.email}"
 
-    payload = json.dumps({
+    payload = orjson.dumps({
         "email": request.email,
         "message": request.message,
     })
@@ -42,10 +39,9 @@ async def send_message(
 
 
 @router.post("/chat/cancel/{email}", response_model=CancelResponse)
-@inject
 async def cancel_chat(
     email: str,
-    broker: EventBrokerPort = Depends(Provide[Container.event_broker]),
+    broker: EventBrokerPort = Depends(get_event_broker),
 ):
     """
     Demande l'annulation du traitement pour un utilisateur.
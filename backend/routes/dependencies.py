@@ -0,0 +1,13 @@
+"""Dependances FastAPI partagees par les routes."""
+from fastapi import Request
+
+from backend.domain.ports.event_broker_port import EventBrokerPort
+
+
+def get_event_broker(request: Request) -> EventBrokerPort:
+    """
+    Retourne le broker resolu une seule fois au demarrage (lifespan).
+
+    Evite de re-resoudre le provider du container a chaque requete.
+    """
+    return request.app.state.event_broker
@@ -1,24 +1,25 @@
 """Route GET /stream/{email} - SSE pour recevoir les reponses."""
 import asyncio
-import json
 
+import orjson
 from fastapi import APIRouter, Depends
 from sse_starlette.sse import EventSourceResponse
-from dependency_injector.wiring import inject, Provide
 
 from backend.domain.ports.event_broker_port import EventBrokerPort
-from backend.infrastructure.container import Container
+from backend.routes.dependencies import get_event_broker
 
 router = APIRouter()
 
 HEARTBEAT_INTERVAL = 30  # secondes
+HEARTBEAT = {"event": "heartbeat", "data": ""}
+# Au-dela, le parsing (figures Plotly, tableaux) se fait hors de la boucle
+LARGE_PAYLOAD = 64 * 1024  # octets
 
 
 @router.get("/stream/{email}")
-@inject
 async def stream_response(
     email: str,
-    broker: EventBrokerPort = Depends(Provide[Container.event_broker]),
+    broker: EventBrokerPort = Depends(get_event_broker),
 ):
     """
     SSE endpoint pour recevoir les reponses de l'agent en streaming.
@@ -29,27 +30,58 @@ async def stream_response(
     async def event_generator():
         channel = f"outbox:{email}"
 
+        loop = asyncio.get_running_loop()
+        tick = asyncio.Event()
+
+        # Un seul timer periodique pour le heartbeat (pas de wait_for par message)
+        def beat():
+            nonlocal timer
+            tick.set()
+            timer = loop.call_later(HEARTBEAT_INTERVAL, beat)
+
+        timer = loop.call_later(HEARTBEAT_INTERVAL, beat)
+
         async with broker.subscribe(channel=channel) as subscription:
-            while True:
-                try:
-                    raw = await asyncio.wait_for(
-                        subscription.get(),
-                        timeout=HEARTBEAT_INTERVAL
+            next_message = asyncio.ensure_future(subscription.get())
+            next_tick = asyncio.ensure_future(tick.wait())
+            try:
+                while True:
+                    await asyncio.wait(
+                        (next_message, next_tick),
+                        return_when=asyncio.FIRST_COMPLETED,
                     )
 
-                    data = json.loads(raw)
-                    yield {"event": "message", "data": json.dumps(data)}
+                    if next_tick.done():
+                        tick.clear()
+                        next_tick = asyncio.ensure_future(tick.wait())
+                        yield HEARTBEAT
 
-                    if data.get("done", False):
-                        break
+                    if not next_message.done():
+                        continue
 
-                except asyncio.TimeoutError:
-                    yield {"event": "heartbeat", "data": ""}
-                except Exception as e:
-                    yield {
-                        "event": "error",
-                        "data": json.dumps({"error": str(e)})
-                    }
-                    break
+                    try:
+                        raw = next_message.result()
+
+                        # Le payload est deja du JSON : on le relaie tel quel
+                        if len(raw) > LARGE_PAYLOAD:
+                            data = await asyncio.to_thread(orjson.loads, raw)
+                        else:
+                            data = orjson.loads(raw)
+                        yield {"event": "message", "data": raw}
+
+                        if data.get("done", False):
+                            break
+
+                        next_message = asyncio.ensure_future(subscription.get())
+                    except Exception as e:
+                        yield {
+                            "event": "error",
+                            "data": orjson.dumps({"error": str(e)}).decode()
+                        }
+                        break
+            finally:
+                timer.cancel()
+                next_message.cancel()
+                next_tick.cancel()
 
     return EventSourceResponse(event_generator())
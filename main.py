@@ -3,40 +3,72 @@
 Data Analysis Agent - Point d'entree principal
 
 Usage:
-    python main.py serve [--channel-type TYPE]  Lance l'agent en mode serveur
+    python main.py serve [--channel-type TYPE] [-v]  Lance l'agent en mode serveur
 """
 
 import argparse
 import asyncio
+import atexit
+import functools
 import logging
+import logging.handlers
+import queue
 import sys
 from datetime import datetime
 from pathlib import Path
 
-# Créer le dossier logs s'il n'existe pas
-logs_dir = Path("logs")
-logs_dir.mkdir(exist_ok=True)
+from src.config import settings
+
 
-# Nom du fichier avec date jj_mm_yyyy
-log_filename = logs_dir / f"{datetime.now().strftime('%d_%m_%Y')}.log"
+def setup_logging(level: str | int):
+    """
+    Configure le logging (fichier logs/jj_mm_yyyy.log + console).
 
-# Configuration du logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
+    Appele depuis main() uniquement : importer ce module ne touche pas
+    au logging. Les handlers (disque, console) tournent dans le thread du
+    QueueListener, la boucle asyncio ne fait qu'un put_nowait.
+    """
+    # Créer le dossier logs s'il n'existe pas
+    logs_dir = Path("logs")
+    logs_dir.mkdir(exist_ok=True)
+
+    # Nom du fichier avec date jj_mm_yyyy
+    log_filename = logs_dir / f"{datetime.now().strftime('%d_%m_%Y')}.log"
+
+    log_formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    log_handlers = [
         logging.FileHandler(log_filename, encoding="utf-8"),
         logging.StreamHandler(),  # Aussi afficher dans la console
     ]
-)
-logging.getLogger("httpcore").setLevel(logging.WARNING)
-logging.getLogger("httpx").setLevel(logging.WARNING)
+    for handler in log_handlers:
+        handler.setFormatter(log_formatter)
 
-from src.infrastructure.container import Container
-from src.config import settings
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    log_listener = logging.handlers.QueueListener(log_queue, *log_handlers, respect_handler_level=True)
+    log_listener.start()
+    atexit.register(log_listener.stop)
+
+    logging.basicConfig(
+        level=level,
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+    )
+    logging.getLogger("httpcore").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+@functools.lru_cache(maxsize=1)
+def get_container():
+    """
+    Construit (une seule fois) le container DI et le wiring.
+
+    Import differe : --help ou une erreur d'argument n'importent pas
+    la stack agent (pydantic-ai, duckdb, etc.).
+    """
+    from src.infrastructure.container import Container
 
-container = Container()
-container.config.channel_type.from_value(settings.CHANNEL_TYPE)
+    container = Container()
+    container.config.channel_type.from_value(settings.CHANNEL_TYPE)
+    return container
 
 
 def print_error(message: str):
@@ -49,7 +81,7 @@ def run_serve():
     Lance le DataAnalysisAgent en mode serveur.
 
     Le MessagingService est injecte automatiquement via @inject dans serve().
-    Le type de canal (redis/memory) est configure via container.config.channel_type.
+    Le type de canal (redis/memory) est configure via get_container().config.channel_type.
     """
     try:
         from src.application.data_analysis_agent import DataAnalysisAgent
@@ -64,7 +96,12 @@ def run_serve():
         print("\nAgent pret a recevoir des messages sur inbox:*")
         print("Appuyez sur Ctrl+C pour arreter.\n")
 
-        asyncio.run(agent.serve())
+        try:
+            import uvloop
+        except ImportError:
+            asyncio.run(agent.serve())
+        else:
+            uvloop.run(agent.serve())
 
     except KeyboardInterrupt:
         print("\nArret demande par l'utilisateur.")
@@ -79,7 +116,14 @@ def run_serve():
         sys.exit(1)
 
 
-def main():
+# Commandes CLI -> handler
+COMMANDS = {
+    "serve": run_serve,
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Construit le parser complet (aide, options, validation)."""
     parser = argparse.ArgumentParser(
         description="Data Analysis Agent - CLI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -87,12 +131,13 @@ def main():
 Exemples:
   python main.py serve                     # Lancer l'agent en mode serveur (Redis)
   python main.py serve --channel-type memory  # Lancer en mode memoire (dev local)
+  python main.py serve -v                  # Logs en DEBUG
         """
     )
 
     parser.add_argument(
         "command",
-        choices=["serve"],
+        choices=list(COMMANDS),
         help="Commande a executer"
     )
     parser.add_argument(
@@ -101,17 +146,40 @@ Exemples:
         choices=["redis", "memory"],
         help="Type de canal pour le mode serve (defaut: redis)"
     )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Logs en DEBUG (defaut: LOG_LEVEL, INFO)"
+    )
+    return parser
+
+
+def dispatch(command: str, channel_type: str | None = None):
+    """Execute une commande deja validee."""
+    container = get_container()
+    if channel_type:
+        container.config.channel_type.from_value(channel_type)
+    COMMANDS[command]()
 
-    if len(sys.argv) == 1:
+
+def main():
+    argv = sys.argv[1:]
+
+    # Fast path : commande seule, pas besoin de construire le parser
+    if len(argv) == 1 and argv[0] in COMMANDS:
+        setup_logging(settings.LOG_LEVEL)
+        dispatch(argv[0])
+        return
+
+    parser = build_parser()
+
+    if not argv:
         parser.print_help()
         sys.exit(0)
 
-    args = parser.parse_args()
-
-    if args.command == "serve":
-        if args.channel_type:
-            container.config.channel_type.from_value(args.channel_type)
-        run_serve()
+    args = parser.parse_args(argv)
+    setup_logging(logging.DEBUG if args.verbose else settings.LOG_LEVEL)
+    dispatch(args.command, args.channel_type)
 
 
 if __name__ == "__main__":
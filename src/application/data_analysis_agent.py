@@ -9,9 +9,11 @@ Ce service :
 """
 
 import asyncio
+import dataclasses
 import logging
+from collections.abc import Sequence
 
-from pydantic import BaseModel, ValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
 from pydantic_ai import Agent
 from pydantic_ai.messages import ModelMessage
 from dependency_injector.wiring import inject, Provide
@@ -22,7 +24,11 @@ from src.application.services.messaging_service import MessagingService
 from src.application.services.cancellation_manager import CancellationManager
 from src.application.services.dataset_loader import DatasetLoader
 from src.application.services.stream_processor import StreamProcessor
-from src.application.services.visualization_retry_manager import VisualizationRetryManager
+from src.application.services.visualization_retry_manager import (
+    MAX_RETRIES,
+    VisualizationRetryManager,
+)
+from src.config import settings
 from src.infrastructure.container import Container
 
 logger = logging.getLogger(__name__)
@@ -33,25 +39,45 @@ class _ParsedMessage(BaseModel):
     message: str
 
 
+_ParsedAdapter = TypeAdapter(_ParsedMessage)
+_ParsedBatch = TypeAdapter(list[_ParsedMessage])
+
+
 class DataAnalysisAgent:
     """Orchestrateur qui coordonne les services pour le traitement des messages."""
 
+    BATCH_MAX_COUNT = 32
+
+    # Run initial + retries de visualisation : même borne que le retry manager
+    MAX_RUNS = MAX_RETRIES + 1
+
     def __init__(self):
         self._agent = None
+        self._base_context: AgentContext | None = None
         self._dataset_loader: DatasetLoader | None = None
         self._cancellation: CancellationManager | None = None
         self._stream_processor: StreamProcessor | None = None
         self._retry_manager: VisualizationRetryManager | None = None
+        # (message, instant de réception) : sert à dater les signaux d'annulation
+        self._work_queue: asyncio.Queue[tuple[_ParsedMessage, float]] = asyncio.Queue(
+            maxsize=settings.AGENT_QUEUE_SIZE
+        )
+        self._tasks: set[asyncio.Task] = set()
 
     @inject
-    def initialize(
+    async def initialize(
         self,
         dataset_loader: DatasetLoader = Provide[Container.dataset_loader],
     ):
-        """Charge les datasets et crée l'agent."""
+        """Charge les datasets (en parallèle, hors boucle) et crée l'agent."""
         self._dataset_loader = dataset_loader
-        self._dataset_loader.load()
+        await self._dataset_loader.load_async()
         self._agent = create_agent(self._dataset_loader.info)
+        # Datasets et info invariants : seul l'email change par requête
+        self._base_context = AgentContext(
+            datasets=self._dataset_loader.datasets,
+            dataset_info=self._dataset_loader.info,
+        )
         logger.info(f"Agent initialisé avec {len(self._dataset_loader.datasets)} dataset(s)")
 
     @inject
@@ -66,82 +92,170 @@ class DataAnalysisAgent:
         self._cancellation = cancellation
         self._stream_processor = stream_processor
         self._retry_manager = retry_manager
-        self.initialize()
+        await self.initialize()
+        if settings.AGENT_PREWARM:
+            self._track(asyncio.create_task(self._prewarm()))
 
         async with messaging, cancellation:
-            logger.info("DataAnalysisAgent en écoute...")
-            async for msg in messaging.listen():
-                asyncio.create_task(self._handle_message(msg))
+            workers = [
+                asyncio.create_task(self._worker())
+                for _ in range(settings.AGENT_MAX_CONCURRENCY)
+            ]
+            logger.info(f"DataAnalysisAgent en écoute ({len(workers)} workers)...")
+            loop = asyncio.get_running_loop()
+            try:
+                async for batch in messaging.listen_batch(
+                    max_count=self.BATCH_MAX_COUNT, max_pending=settings.AGENT_QUEUE_SIZE
+                ):
+                    received_at = loop.time()
+                    for parsed in self._parse_batch(batch):
+                        # Backpressure : attend une place si la queue est pleine
+                        await self._work_queue.put((parsed, received_at))
+
+                # Fin du flux entrant : terminer les requêtes en attente
+                await self._work_queue.join()
+            finally:
+                for worker in workers:
+                    worker.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _worker(self) -> None:
+        """Traite les requêtes de la queue une par une."""
+        while True:
+            parsed, received_at = await self._work_queue.get()
+            try:
+                await self._handle_message(parsed, received_at)
+            except Exception as e:
+                logger.error(f"Erreur du worker: {e}", exc_info=True)
+            finally:
+                self._work_queue.task_done()
+
+    def _track(self, task: asyncio.Task) -> None:
+        """Garde une référence sur la tâche jusqu'à sa fin."""
+        self._tasks.add(task)
+        task.add_done_callback(self._on_task_done)
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        """Libère la référence de la tâche terminée."""
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Tâche de fond en erreur: {task.exception()}")
 
-    async def _handle_message(self, msg):
-        """Parse et traite un message."""
+    async def _prewarm(self) -> None:
+        """
+        Exécute un run minimal pour préchauffer le client LLM.
+
+        Le premier vrai message évite ainsi la connexion HTTP/TLS et
+        l'initialisation paresseuse du modèle. Consomme quelques tokens.
+        """
         try:
-            parsed = _ParsedMessage(**msg.data)
-        except ValidationError as e:
-            logger.warning(f"Message invalide: {e}")
-            return
+            async with self._agent.iter(
+                "ping", deps=dataclasses.replace(self._base_context)
+            ) as run:
+                async for node in run:
+                    # La réponse du modèle est arrivée : le client est chaud
+                    if Agent.is_call_tools_node(node) or Agent.is_end_node(node):
+                        break
+            logger.info("Agent préchauffé")
+        except Exception as e:
+            logger.warning(f"Préchauffage de l'agent échoué: {e}")
 
-        logger.info(f"[AGENT:{parsed.email}] New request: {parsed.message[:50]}...")
+    @staticmethod
+    def _parse_batch(batch) -> list[_ParsedMessage]:
+        """Valide un lot de messages en une passe, message par message en cas d'erreur."""
+        try:
+            return _ParsedBatch.validate_python([msg.data for msg in batch])
+        except ValidationError:
+            pass
+
+        parsed_messages = []
+        for msg in batch:
+            try:
+                parsed_messages.append(_ParsedAdapter.validate_python(msg.data))
+            except ValidationError as e:
+                logger.warning(f"Message invalide: {e}")
+        return parsed_messages
+
+    async def _handle_message(self, parsed: _ParsedMessage, received_at: float):
+        """Traite un message déjà validé, reçu à received_at (horloge de la boucle)."""
+        logger.info("[AGENT:%s] New request: %.50s...", parsed.email, parsed.message)
 
         try:
-            await self._process_request(parsed)
+            await self._process_request(parsed, received_at)
         except Exception as e:
             logger.error(f"[AGENT:{parsed.email}] Error: {e}", exc_info=True)
             await self._stream_processor.publish_error(parsed.email, str(e))
 
-    async def _process_request(self, parsed: _ParsedMessage):
+    async def _process_request(self, parsed: _ParsedMessage, received_at: float):
         """Exécute l'agent avec retry automatique pour les visualisations."""
         email = parsed.email
-        context = AgentContext(
-            datasets=self._dataset_loader.datasets,
-            dataset_info=self._dataset_loader.info,
-            email=email,
-        )
+        # Copie légère : références partagées, connexion DuckDB et caches neufs
+        context = dataclasses.replace(self._base_context, email=email)
 
-        # Initialiser l'état de retry pour cette requête
+        # Initialiser l'état de retry et de cancellation pour cette requête
         self._retry_manager.start_request(email)
+        self._cancellation.begin(email, received_at)
 
-        prompt = parsed.message
-        message_history: list[ModelMessage] = []
-        run_count = 0
+        try:
+            # Annulée pendant son attente dans la queue : DONE sans lancer l'agent
+            if await self._cancellation.handle_if_cancelled(email):
+                logger.info("[AGENT:%s] Cancelled before start", email)
+                return
 
-        while True:
-            run_count += 1
-            buffer = ""
+            prompt = parsed.message
+            message_history: Sequence[ModelMessage] = ()
 
-            logger.debug(
-                f"[AGENT:{email}] Starting run #{run_count}, "
-                f"history_len={len(message_history)}, prompt_len={len(prompt)}"
-            )
+            for run_count in range(1, self.MAX_RUNS + 1):
+                buffer_parts: list[str] = []
 
-            async with self._agent.iter(
-                prompt,
-                deps=context,
-                message_history=message_history,
-            ) as run:
-                async for node in run:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "[AGENT:%s] Starting run #%d, history_len=%d, prompt_len=%d",
+                        email, run_count, len(message_history), len(prompt),
+                    )
 
-                    if await self._cancellation.handle_if_cancelled(email):
-                        logger.info(f"[AGENT:{email}] Cancelled during run #{run_count}")
-                        return
+                async with self._agent.iter(
+                    prompt,
+                    deps=context,
+                    message_history=message_history,
+                ) as run:
+                    async for node in run:
 
-                    if Agent.is_end_node(node):
-                        logger.debug(f"[AGENT:{email}] Run #{run_count} ended")
-                        break
+                        # Check local O(1) ; on n'await qu'en cas d'annulation
+                        if self._cancellation.is_cancelled(email):
+                            await self._cancellation.handle_if_cancelled(email)
+                            logger.info("[AGENT:%s] Cancelled during run #%d", email, run_count)
+                            return
 
-                    buffer, _ = await self._stream_processor.process_node(
-                        node, run.ctx, email, buffer
-                    )
+                        if Agent.is_end_node(node):
+                            logger.debug("[AGENT:%s] Run #%d ended", email, run_count)
+                            break
 
-                # Évaluer et finaliser ou obtenir les paramètres de retry
-                decision = await self._retry_manager.finalize_or_retry(email, run, buffer)
+                        await self._stream_processor.process_node(
+                            node, run.ctx, email, buffer_parts
+                        )
 
-                if decision is None:
-                    # Finalisé (succès ou erreur) - réponse déjà publiée
-                    logger.info(f"[AGENT:{email}] Request completed after {run_count} run(s)")
-                    return
+                    # Évaluer et finaliser ou obtenir les paramètres de retry
+                    decision = await self._retry_manager.finalize_or_retry(email, run, buffer_parts)
 
-                # Retry nécessaire - préparer le prochain run
-                logger.debug(f"[AGENT:{email}] Preparing retry with prompt: {decision.retry_prompt[:50]}...")
-                message_history = decision.message_history
-                prompt = decision.retry_prompt
+                    if decision is None:
+                        # Finalisé (succès ou erreur) - réponse déjà publiée
+                        logger.info("[AGENT:%s] Request completed after %d run(s)", email, run_count)
+                        return
+
+                    # Retry nécessaire - préparer le prochain run
+                    logger.debug("[AGENT:%s] Preparing retry with prompt: %.50s...", email, decision.retry_prompt)
+                    message_history = decision.message_history
+                    prompt = decision.retry_prompt
+
+            # Garde-fou : le retry manager finalise normalement avant ce point
+            logger.warning("[AGENT:%s] Gave up after %d run(s)", email, self.MAX_RUNS)
+            await self._stream_processor.publish_error(
+                email, "Nombre maximal de tentatives atteint."
+            )
+        finally:
+            # Quelle que soit l'issue (succès, annulation, abandon, erreur),
+            # la requête suivante repart sans état résiduel
+            self._retry_manager.end_request(email)
+            self._cancellation.clear(email)
+            context.close()
@@ -9,7 +9,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from typing import TYPE_CHECKING, Optional, Set
+from typing import TYPE_CHECKING, Dict, Optional
 
 from src.domain.ports.message_channel_port import MessageChannel
 from src.domain.enums import SSEEventType
@@ -27,6 +27,13 @@ class CancellationManager:
     Au lieu de polling (GET à chaque node), écoute les signaux
     en background et maintient un set local pour des checks O(1).
 
+    Multi-workers : chaque process s'abonne à cancel:*, donc tous les
+    workers reçoivent chaque signal (Pub/Sub diffuse à tous les abonnés).
+    Seul le worker qui exécute la requête le consomme ; les autres
+    gardent un flag orphelin. Chaque flag est daté : begin() efface ceux
+    antérieurs à la réception de la requête suivante, mais garde un
+    cancel envoyé pendant que la requête attendait dans la queue.
+
     Usage:
         async with cancellation_manager:
             # Dans la boucle agent
@@ -34,7 +41,12 @@ class CancellationManager:
                 return
     """
 
-    CANCEL_PATTERN = "cancel:*"
+    __slots__ = (
+        "_channel", "_messaging", "_cancelled", "_listener_task", "_running",
+    )
+
+    CANCEL_PREFIX = "cancel:"
+    CANCEL_PATTERN = f"{CANCEL_PREFIX}*"
 
     def __init__(self, channel: MessageChannel, messaging: MessagingService):
         """
@@ -44,7 +56,8 @@ class CancellationManager:
         """
         self._channel = channel
         self._messaging = messaging
-        self._cancelled: Set[str] = set()
+        # email -> instant de réception du signal (horloge de la boucle)
+        self._cancelled: Dict[str, float] = {}
         self._listener_task: Optional[asyncio.Task] = None
         self._running = False
 
@@ -77,8 +90,11 @@ class CancellationManager:
                 if not self._running:
                     break
                 # channel = "cancel:user@email.com"
-                email = message.channel.split(":", 1)[1]
-                self._cancelled.add(email)
+                email = message.channel.removeprefix(self.CANCEL_PREFIX)
+                if email == message.channel:
+                    logger.warning(f"[CANCEL] Canal inattendu ignoré: {message.channel}")
+                    continue
+                self._cancelled[email] = asyncio.get_running_loop().time()
                 logger.info(f"[CANCEL] Signal reçu pour {email}")
         except asyncio.CancelledError:
             pass
@@ -99,6 +115,22 @@ class CancellationManager:
         """
         return email in self._cancelled
 
+    def begin(self, email: str, received_at: float) -> None:
+        """
+        Prépare une nouvelle requête : oublie un signal antérieur à sa réception.
+
+        Un cancel reçu avant la requête (autre worker, requête déjà
+        terminée) ne doit pas l'annuler ; un cancel reçu pendant qu'elle
+        attendait dans la queue reste actif.
+
+        Args:
+            email: Email de l'utilisateur
+            received_at: Instant de réception de la requête (loop.time())
+        """
+        signal_at = self._cancelled.get(email)
+        if signal_at is not None and signal_at < received_at:
+            del self._cancelled[email]
+
     def clear(self, email: str) -> None:
         """
         Nettoie le flag de cancellation après traitement.
@@ -106,7 +138,7 @@ class CancellationManager:
         Args:
             email: Email de l'utilisateur
         """
-        self._cancelled.discard(email)
+        self._cancelled.pop(email, None)
         logger.debug(f"Cancellation cleared pour {email}")
 
     async def handle_if_cancelled(self, email: str) -> bool:
@@ -116,7 +148,7 @@ class CancellationManager:
         Si cancelled:
         - Log l'arrêt
         - Clear le flag
-        - Publie DONE
+        - Publie DONE (avant tout événement d'une requête suivante)
         - Retourne True
 
         Args:
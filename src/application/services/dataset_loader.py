@@ -1,12 +1,58 @@
 """Service de chargement des datasets."""
+import asyncio
 import logging
+import os
 from pathlib import Path
-from typing import Dict
+from types import MappingProxyType
+from typing import Dict, Mapping
 
 import pandas as pd
+import pyarrow as pa
 
 logger = logging.getLogger(__name__)
 
+# CSV déjà parsés, par chemin : (mtime_ns, DataFrame). Partagé entre loaders.
+_CSV_CACHE: Dict[Path, tuple[int, pd.DataFrame]] = {}
+
+
+def _read_csv(path: Path, mtime_ns: int) -> pd.DataFrame:
+    """Lit un CSV, ou le reprend du cache s'il n'a pas changé depuis."""
+    cached = _CSV_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    try:
+        # Lecteur Arrow multithread ; dtypes numpy conservés pour DuckDB/plotly
+        df = pd.read_csv(path, engine="pyarrow")
+    except (pa.ArrowInvalid, ValueError) as e:
+        logger.warning(f"Lecture pyarrow impossible pour {path.name} ({e}), moteur C utilisé")
+        df = pd.read_csv(path)
+    _CSV_CACHE[path] = (mtime_ns, df)
+    return df
+
+
+# Ligne de description par CSV : (mtime_ns, "- **name**: ...")
+_INFO_CACHE: Dict[Path, tuple[int, str]] = {}
+
+
+def _describe(path: Path, mtime_ns: int, df: pd.DataFrame) -> str:
+    """Décrit un dataset, en réutilisant la ligne tant que le CSV n'a pas changé."""
+    cached = _INFO_CACHE.get(path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    cols = ", ".join(f"{c} ({dt})" for c, dt in df.dtypes.items())
+    line = f"- **{path.stem}**: {df.shape[0]} rows, columns: {cols}"
+    _INFO_CACHE[path] = (mtime_ns, line)
+    return line
+
+
+def _prune(data_dir: Path, files: list[tuple[Path, int]]) -> None:
+    """Retire des caches les CSV de data_dir absents du dernier listing."""
+    present = {path for path, _ in files}
+    for cache in (_CSV_CACHE, _INFO_CACHE):
+        stale = [p for p in cache if p.parent == data_dir and p not in present]
+        for path in stale:
+            del cache[path]
+
 
 class DatasetLoader:
     """Charge et décrit les datasets CSV."""
@@ -14,35 +60,59 @@ class DatasetLoader:
     def __init__(self, data_dir: Path = Path("data")):
         self._data_dir = data_dir
         self._datasets: Dict[str, pd.DataFrame] = {}
+        self._datasets_view: Mapping[str, pd.DataFrame] = MappingProxyType(self._datasets)
         self._info: str = ""
 
     def load(self) -> None:
         """Charge tous les CSV du dossier data/."""
-        self._datasets = {}
-        if not self._data_dir.exists():
-            self._info = "No datasets available."
-            return
+        files = self._scan()
+        frames = [_read_csv(path, mtime_ns) for path, mtime_ns in files]
+        self._set(files, frames)
 
-        for csv_file in sorted(self._data_dir.glob("*.csv")):
-            self._datasets[csv_file.stem] = pd.read_csv(csv_file)
+    async def load_async(self) -> None:
+        """Charge les CSV en parallèle dans des threads, sans bloquer la boucle."""
+        files = await asyncio.to_thread(self._scan)
+        frames = await asyncio.gather(
+            *(asyncio.to_thread(_read_csv, path, mtime_ns) for path, mtime_ns in files)
+        )
+        self._set(files, frames)
 
-        self._info = self._generate_info()
-        logger.info(f"Chargé {len(self._datasets)} dataset(s)")
+    def _scan(self) -> list[tuple[Path, int]]:
+        """Liste les CSV de data/ triés par nom, avec leur mtime."""
+        if not self._data_dir.exists():
+            return []
 
-    def _generate_info(self) -> str:
-        """Génère la description des datasets."""
-        if not self._datasets:
-            return "No datasets available."
+        # scandir + endswith : pas de fnmatch ni de Path par entrée ignorée,
+        # et le stat() de la DirEntry sert de clé mtime
+        with os.scandir(self._data_dir) as it:
+            entries = sorted(
+                (e for e in it if e.name.endswith(".csv") and e.is_file()),
+                key=lambda e: e.name,
+            )
+        return [(Path(e.path), e.stat().st_mtime_ns) for e in entries]
 
-        parts = []
-        for name, df in self._datasets.items():
-            cols = ", ".join(f"{c} ({df[c].dtype})" for c in df.columns)
-            parts.append(f"- **{name}**: {df.shape[0]} rows, columns: {cols}")
-        return "\n".join(parts)
+    def _set(self, files: list[tuple[Path, int]], frames: list[pd.DataFrame]) -> None:
+        """Publie les datasets chargés et leur description."""
+        # Fichiers supprimés ou renommés : libère leurs DataFrames en cache
+        _prune(self._data_dir, files)
+        self._datasets = {path.stem: df for (path, _), df in zip(files, frames)}
+        self._datasets_view = MappingProxyType(self._datasets)
+
+        info_parts = [
+            _describe(path, mtime_ns, df) for (path, mtime_ns), df in zip(files, frames)
+        ]
+        self._info = "\n".join(info_parts) if info_parts else "No datasets available."
+        logger.info(f"Chargé {len(self._datasets)} dataset(s)")
 
     @property
-    def datasets(self) -> Dict[str, pd.DataFrame]:
-        return self._datasets.copy()
+    def datasets(self) -> Mapping[str, pd.DataFrame]:
+        """
+        Vue en lecture seule, partagée par toutes les requêtes (pas de copie).
+
+        Les DataFrames sont partagés : un outil qui les modifie doit
+        travailler sur sa propre .copy().
+        """
+        return self._datasets_view
 
     @property
     def info(self) -> str:
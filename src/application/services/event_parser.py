@@ -1,7 +1,7 @@
 """Service de parsing des events PydanticAI."""
-import json
+import re
 from dataclasses import dataclass
-from typing import Any, Dict
+from typing import Any, Dict, Final, Optional
 
 from pydantic_ai import FunctionToolResultEvent
 from pydantic_ai.messages import (
@@ -15,53 +15,73 @@ from pydantic_ai.messages import (
 
 from src.domain.enums import SSEEventType, ToolResultMarker
 
+# Marqueurs en str simples : l'enum reste l'API publique, le hot path
+# manipule des str (hash/égalité natifs, pas de passage par l'enum)
+_PLOTLY_MARK: Final[str] = ToolResultMarker.PLOTLY_JSON.value
+_TABLE_MARK: Final[str] = ToolResultMarker.TABLE_JSON.value
 
-@dataclass
+# Un seul scan pour tous les marqueurs : s'arrête au premier trouvé, qui est
+# dans l'en-tête du résultat (avant le JSON, potentiellement volumineux)
+_MARKER_RE = re.compile(f"{re.escape(_PLOTLY_MARK)}|{re.escape(_TABLE_MARK)}")
+_MARKER_EVENTS: Final[dict[str, SSEEventType]] = {
+    _PLOTLY_MARK: SSEEventType.PLOTLY,
+    _TABLE_MARK: SSEEventType.DATA_TABLE,
+}
+
+# Dispatch par type exact (un lookup dict au lieu de cascades d'isinstance)
+_PART_KINDS = {TextPart: SSEEventType.TEXT, ThinkingPart: SSEEventType.THINKING}
+_DELTA_KINDS = {TextPartDelta: SSEEventType.TEXT, ThinkingPartDelta: SSEEventType.THINKING}
+
+
+@dataclass(slots=True, frozen=True)
 class ParsedToolResult:
-    """Résultat parsé d'un tool call."""
+    """
+    Résultat parsé d'un tool call.
+
+    Pour les visualisations, raw_json contient le JSON produit par le tool,
+    à publier tel quel (data reste vide).
+    """
 
     event_type: str
     data: Dict[str, Any]
+    raw_json: Optional[str] = None
 
 
 class EventParser:
     """Parse les events de streaming PydanticAI."""
 
-    def extract_content(self, event) -> str | None:
-        """Extrait le contenu textuel d'un event."""
-        if isinstance(event, PartStartEvent):
-            if isinstance(event.part, (ThinkingPart, TextPart)):
-                return event.part.content or None
-        elif isinstance(event, PartDeltaEvent):
-            if isinstance(event.delta, (ThinkingPartDelta, TextPartDelta)):
-                return event.delta.content_delta or None
-        return None
-
-    def is_text_event(self, event) -> bool:
-        """Retourne True si l'event est du texte (à bufferiser)."""
-        if isinstance(event, PartStartEvent):
-            return isinstance(event.part, TextPart)
-        elif isinstance(event, PartDeltaEvent):
-            return isinstance(event.delta, TextPartDelta)
-        return False
+    def classify(self, event) -> tuple[SSEEventType | None, str | None]:
+        """
+        Retourne (type, contenu) d'un event de streaming en une seule passe.
+
+        type vaut TEXT (à bufferiser) ou THINKING ; (None, None) pour les
+        autres events. Le contenu vide est normalisé en None.
+        """
+        event_type = type(event)
+        if event_type is PartDeltaEvent:  # Le plus fréquent : un par token
+            kind = _DELTA_KINDS.get(type(event.delta))
+            if kind is not None:
+                return kind, event.delta.content_delta or None
+        elif event_type is PartStartEvent:
+            kind = _PART_KINDS.get(type(event.part))
+            if kind is not None:
+                return kind, event.part.content or None
+        return None, None
 
     def parse_tool_result(self, event: FunctionToolResultEvent) -> ParsedToolResult:
         """Parse le résultat d'un tool et retourne le type + data."""
         result_str = str(event.result.content)
 
-        if ToolResultMarker.PLOTLY_JSON in result_str:
-            data = json.loads(result_str.split(ToolResultMarker.PLOTLY_JSON, 1)[1])
-            return ParsedToolResult(SSEEventType.PLOTLY, {"json": data})
-
-        elif ToolResultMarker.TABLE_JSON in result_str:
-            data = json.loads(result_str.split(ToolResultMarker.TABLE_JSON, 1)[1])
-            return ParsedToolResult(SSEEventType.DATA_TABLE, {"json": data})
-
-        else:
+        match = _MARKER_RE.search(result_str)
+        if match is not None:
             return ParsedToolResult(
-                SSEEventType.TOOL_CALL_RESULT,
-                {
-                    "tool_call_id": event.tool_call_id,
-                    "result": result_str,
-                },
+                _MARKER_EVENTS[match.group()], {}, raw_json=result_str[match.end():]
             )
+
+        return ParsedToolResult(
+            SSEEventType.TOOL_CALL_RESULT,
+            {
+                "tool_call_id": event.tool_call_id,
+                "result": result_str,
+            },
+        )
@@ -5,8 +5,12 @@ Ce service abstrait les détails d'implémentation (patterns, préfixes, format)
 pour que l'appelant puisse simplement publish/listen sans se soucier de la config.
 """
 
+import asyncio
 import logging
-from typing import AsyncIterator
+from typing import AsyncIterator, Optional
+
+import orjson
+from cachetools import LRUCache
 
 from src.domain.ports.message_channel_port import MessageChannel, Message
 
@@ -27,11 +31,22 @@ class MessagingService:
             async for msg in messaging.listen():
                 await messaging.publish_chunk(email, "Hello")
                 await messaging.publish_chunk(email, "", done=True)
+
+        # Ou par lots:
+            async for batch in messaging.listen_batch(max_count=32, max_pending=256):
+                ...
     """
 
     INBOX_PATTERN = "inbox:*"
     OUTBOX_PREFIX = "outbox:"
 
+    # Regroupement des publications sortantes (un pipeline Redis par lot)
+    BATCH_MAX = 100
+    BATCH_WINDOW_MS = 5
+
+    # Noms de canaux outbox mémorisés par email (borné : pas de fuite)
+    OUTBOX_CACHE_SIZE = 10_000
+
     def __init__(self, channel: MessageChannel):
         """
         Initialise le service avec un canal de messaging.
@@ -41,6 +56,14 @@ class MessagingService:
         """
         self._channel = channel
         self._connected = False
+        # File unique : l'ordre de publication est conservé pour chaque outbox.
+        # Chaque élément peut porter un Future résolu une fois son lot publié.
+        self._outgoing: asyncio.Queue[
+            tuple[Optional[str], bytes, Optional[asyncio.Future]]
+        ] = asyncio.Queue()
+        self._flush_now = asyncio.Event()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._outbox_names: LRUCache = LRUCache(maxsize=self.OUTBOX_CACHE_SIZE)
 
     async def start(self) -> None:
         """
@@ -51,6 +74,7 @@ class MessagingService:
         logger.info(f"Démarrage du MessagingService sur {self.INBOX_PATTERN}...")
         await self._channel.connect()
         await self._channel.subscribe(self.INBOX_PATTERN)
+        self._flush_task = asyncio.create_task(self._flush_loop())
         self._connected = True
         logger.info("MessagingService connecté et en écoute")
 
@@ -62,6 +86,7 @@ class MessagingService:
         """
         if self._connected:
             logger.info("Arrêt du MessagingService...")
+            await self._drain()
             await self._channel.disconnect()
             self._connected = False
             logger.info("MessagingService déconnecté")
@@ -80,19 +105,93 @@ class MessagingService:
             raise ConnectionError("MessagingService non connecté. Utilisez 'async with' ou appelez start().")
         return self._channel.listen()
 
+    async def listen_batch(
+        self, max_count: int = 32, max_pending: int = 256
+    ) -> AsyncIterator[list[Message]]:
+        """
+        Écoute les messages entrants par lots.
+
+        Attend le premier message puis y ajoute ceux déjà arrivés (au plus
+        max_count), sans attendre de fenêtre : un message isolé part tout
+        de suite, une rafale est découpée en lots.
+
+        Args:
+            max_count: Taille maximale d'un lot
+            max_pending: Messages reçus en attente au plus ; au-delà, la
+                lecture du canal est suspendue (backpressure)
+
+        Yields:
+            list[Message]: Lot de messages reçus sur le canal inbox
+
+        Raises:
+            ConnectionError: Si le service n'est pas connecté
+        """
+        if not self._connected:
+            raise ConnectionError("MessagingService non connecté. Utilisez 'async with' ou appelez start().")
+
+        # Une tâche dédiée consomme listen() : on n'annule jamais le générateur
+        # du canal au milieu d'une lecture, seulement l'attente sur la queue.
+        queue: asyncio.Queue[Optional[Message]] = asyncio.Queue(maxsize=max_pending)
+
+        async def pump() -> None:
+            try:
+                async for msg in self._channel.listen():
+                    await queue.put(msg)
+            finally:
+                # Sentinel de fin, sauf si le consommateur a annulé la pompe
+                if not asyncio.current_task().cancelling():
+                    await queue.put(None)
+
+        pump_task = asyncio.create_task(pump())
+
+        try:
+            while True:
+                msg = await queue.get()
+                if msg is None:
+                    await pump_task  # Propage l'erreur éventuelle du canal
+                    return
+
+                batch = [msg]
+                ended = False
+
+                while len(batch) < max_count:
+                    try:
+                        msg = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if msg is None:
+                        ended = True
+                        break
+                    batch.append(msg)
+
+                yield batch
+
+                if ended:
+                    await pump_task
+                    return
+        finally:
+            pump_task.cancel()
+
     async def publish_chunk(self, email: str, chunk: str, done: bool = False) -> None:
         """
         Publie un chunk de réponse vers l'utilisateur.
 
+        Le chunk est mis en file et publié par lot (au plus BATCH_MAX
+        messages ou BATCH_WINDOW_MS). Le dernier chunk (done=True) force
+        l'envoi immédiat du lot et attend que ce chunk soit publié (donc
+        tous ceux qui le précèdent pour cet utilisateur).
+
         Args:
             email: Email de l'utilisateur (identifiant du canal de sortie)
             chunk: Contenu du chunk à envoyer
             done: True si c'est le dernier chunk de la réponse
         """
-        outbox = f"{self.OUTBOX_PREFIX}{email}"
-        await self._channel.publish(outbox, {"chunk": chunk, "done": done})
+        ack = self._enqueue(
+            self._outbox(email), orjson.dumps({"chunk": chunk, "done": done}), ack=done
+        )
 
-        if done:
+        if ack is not None:
+            await ack
             logger.debug(f"Réponse complète envoyée à {email}")
 
     async def publish_event(
@@ -101,22 +200,67 @@ class MessagingService:
         """
         Publie un événement typé vers l'utilisateur.
 
+        Les événements intermédiaires sont mis en file sans attendre
+        l'accusé du broker ; seul l'événement terminal (done=True) attend
+        sa propre publication, qui confirme aussi celle des événements
+        précédents de l'utilisateur (file FIFO).
+
         Args:
             email: Email de l'utilisateur (identifiant du canal de sortie)
             event_type: Type d'événement (thinking, text, tool_call_start, tool_call_result, plotly, data_table, done, error)
             data: Données de l'événement
             done: True si c'est le dernier événement du stream
         """
-        outbox = f"{self.OUTBOX_PREFIX}{email}"
-        await self._channel.publish(outbox, {
+        ack = self._enqueue(self._outbox(email), orjson.dumps({
             "type": event_type,
             "data": data,
             "done": done,
-        })
+        }), ack=done)
 
-        if done:
+        if ack is not None:
+            await ack
             logger.debug(f"Stream terminé pour {email}")
 
+    async def publish_raw_event(
+        self, email: str, event_type: str, raw_json: str, done: bool = False
+    ) -> None:
+        """
+        Publie un événement dont data vaut {"json": <raw_json>} sans re-sérialiser.
+
+        raw_json doit être un document JSON valide : il est inséré tel quel
+        dans l'enveloppe, ce qui évite un loads + dumps des gros payloads
+        (figures Plotly, tableaux).
+
+        Args:
+            email: Email de l'utilisateur (identifiant du canal de sortie)
+            event_type: Type d'événement (plotly, data_table, ...)
+            raw_json: JSON déjà sérialisé produit par un tool
+            done: True si c'est le dernier événement du stream
+        """
+        payload = b"".join((
+            b'{"type":', orjson.dumps(event_type),
+            b',"data":{"json":', raw_json.encode("utf-8"),
+            b'},"done":', b"true" if done else b"false",
+            b"}",
+        ))
+        await self.publish_serialized(email, payload, done=done)
+
+    async def publish_serialized(self, email: str, payload: bytes, done: bool = False) -> None:
+        """
+        Publie une enveloppe d'événement déjà sérialisée en JSON.
+
+        Même file que publish_event : l'ordre des événements est conservé.
+
+        Args:
+            email: Email de l'utilisateur (identifiant du canal de sortie)
+            payload: Enveloppe {"type", "data", "done"} encodée en UTF-8
+            done: True si c'est le dernier événement du stream
+        """
+        ack = self._enqueue(self._outbox(email), payload, ack=done)
+
+        if ack is not None:
+            await ack
+
     async def publish_error(self, email: str, error: str) -> None:
         """
         Publie une erreur vers l'utilisateur.
@@ -128,6 +272,94 @@ class MessagingService:
         logger.error(f"Erreur pour {email}: {error}")
         await self.publish_chunk(email, f"Erreur: {error}", done=True)
 
+    def _outbox(self, email: str) -> str:
+        """Retourne le nom du canal de sortie de l'utilisateur (mis en cache)."""
+        outbox = self._outbox_names.get(email)
+        if outbox is None:
+            outbox = self._outbox_names[email] = f"{self.OUTBOX_PREFIX}{email}"
+        return outbox
+
+    def _enqueue(
+        self, outbox: str, payload: bytes, ack: bool = False
+    ) -> Optional[asyncio.Future]:
+        """
+        Ajoute un payload sérialisé à la file de publication.
+
+        Avec ack=True, le lot en cours part sans attendre la fenêtre et le
+        Future retourné est résolu quand ce payload a été publié.
+        """
+        if not self._connected:
+            raise ConnectionError("MessagingService non connecté. Utilisez 'async with' ou appelez start().")
+        future = asyncio.get_running_loop().create_future() if ack else None
+        self._outgoing.put_nowait((outbox, payload, future))
+        if future is not None:
+            self._flush_now.set()
+        return future
+
+    async def flush(self) -> None:
+        """
+        Force l'envoi du lot en cours et attend la publication de tout ce
+        qui a été mis en file avant l'appel.
+
+        Un marqueur sans payload est placé en file : les messages ajoutés
+        ensuite par d'autres producteurs ne retardent pas le retour.
+        """
+        marker = asyncio.get_running_loop().create_future()
+        self._outgoing.put_nowait((None, b"", marker))
+        self._flush_now.set()
+        await marker
+
+    async def _flush_loop(self) -> None:
+        """Publie la file par lots via MessageChannel.publish_many."""
+        window = self.BATCH_WINDOW_MS / 1000
+
+        while True:
+            batch = [await self._outgoing.get()]
+
+            if not self._flush_now.is_set():
+                try:
+                    await asyncio.wait_for(self._flush_now.wait(), window)
+                except asyncio.TimeoutError:
+                    pass
+            self._flush_now.clear()
+
+            while len(batch) < self.BATCH_MAX:
+                try:
+                    batch.append(self._outgoing.get_nowait())
+                except asyncio.QueueEmpty:
+                    break
+
+            messages = [(outbox, payload) for outbox, payload, _ in batch if outbox is not None]
+            error: Optional[Exception] = None
+            if messages:
+                try:
+                    await self._channel.publish_many(messages)
+                except Exception as e:
+                    logger.error(f"Échec de publication d'un lot de {len(messages)} messages: {e}")
+                    error = e
+
+            # Confirme les appelants qui attendent un élément de ce lot
+            for outbox, _, future in batch:
+                if future is None or future.done():
+                    continue
+                if error is not None and outbox is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(None)
+
+    async def _drain(self) -> None:
+        """Publie ce qui reste en file puis arrête la tâche de flush."""
+        if self._flush_task is None:
+            return
+        if not self._flush_task.done():
+            await self.flush()
+        self._flush_task.cancel()
+        try:
+            await self._flush_task
+        except asyncio.CancelledError:
+            pass
+        self._flush_task = None
+
     async def __aenter__(self) -> "MessagingService":
         """Context manager: connexion automatique."""
         await self.start()
@@ -1,9 +1,11 @@
 """Service de traitement du stream PydanticAI."""
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
 
+import orjson
 from pydantic_ai import Agent, FunctionToolCallEvent, FunctionToolResultEvent
 
 from src.application.services.event_parser import EventParser
@@ -18,9 +20,66 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class _DeltaCoalescer:
+    """
+    Regroupe les deltas de texte avant publication.
+
+    Flush quand MAX_CHARS caractères sont en attente, MAX_DELAY secondes
+    après le premier delta en attente, ou à la fermeture. Les publications
+    passent par un verrou FIFO pour conserver l'ordre des chunks.
+    """
+
+    MAX_CHARS = 512
+    MAX_DELAY = 0.02  # secondes
+
+    def __init__(self, publish: Callable[[str], Awaitable[None]]):
+        self._publish = publish
+        self._parts: list[str] = []
+        self._size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock = asyncio.Lock()
+        self._tasks: set[asyncio.Task] = set()
+
+    async def add(self, content: str) -> None:
+        self._parts.append(content)
+        self._size += len(content)
+        if self._size >= self.MAX_CHARS:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.MAX_DELAY, self._on_timer)
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        task = asyncio.create_task(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._parts:
+            return
+        content = "".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        async with self._lock:
+            await self._publish(content)
+
+    async def aclose(self) -> None:
+        """Publie le reliquat et attend les flushs déclenchés par le timer."""
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks)
+
+
 class StreamProcessor:
     """Traite les nodes PydanticAI et publie les events SSE."""
 
+    # Enveloppe THINKING pré-sérialisée : seul le contenu est encodé à chaque flush
+    _THINKING_PREFIX = b'{"type":' + orjson.dumps(SSEEventType.THINKING.value) + b',"data":{"content":'
+    _THINKING_SUFFIX = b'},"done":false}'
+
     def __init__(
         self,
         messaging: MessagingService,
@@ -30,88 +89,129 @@ class StreamProcessor:
         self._messaging = messaging
         self._parser = parser
         self._retry_manager = retry_manager
+        # type(node) -> handler, rempli au premier node de chaque type
+        self._dispatch: dict[type, Callable[..., Awaitable[bool]]] = {}
+        self._tool_handlers: dict[type, Callable[..., Awaitable[None]]] = {
+            FunctionToolCallEvent: self._on_tool_call,
+            FunctionToolResultEvent: self._on_tool_result,
+        }
 
     async def process_node(
-        self, node, ctx, email: str, buffer: str
-    ) -> tuple[str, bool]:
+        self, node, ctx, email: str, buffer_parts: list[str]
+    ) -> bool:
         """
-        Traite un node et retourne (buffer_updated, is_end).
+        Traite un node et retourne is_end.
 
         Args:
             node: Node PydanticAI à traiter
             ctx: Contexte du run
             email: Email de l'utilisateur
-            buffer: Buffer de texte accumulé
+            buffer_parts: Fragments de texte accumulés (modifiés sur place)
 
         Returns:
-            Tuple (nouveau_buffer, is_end)
+            True si le node est le node de fin
         """
-        node_type = type(node).__name__
-        logger.debug(f"[STREAM:{email}] Processing node: {node_type}")
+        node_type = type(node)
+        logger.debug("[STREAM:%s] Processing node: %s", email, node_type.__name__)
 
-        if Agent.is_model_request_node(node):
-            buffer = await self._handle_model_request(node, ctx, email, buffer)
-            logger.debug(f"[STREAM:{email}] ModelRequest done, buffer_len={len(buffer)}")
-            return buffer, False
+        handler = self._dispatch.get(node_type) or self._resolve_handler(node)
+        return await handler(node, ctx, email, buffer_parts)
 
+    def _resolve_handler(self, node) -> Callable[..., Awaitable[bool]]:
+        """Identifie le handler d'un type de node inconnu et le met en cache."""
+        if Agent.is_model_request_node(node):
+            handler = self._on_model_request
         elif Agent.is_call_tools_node(node):
-            await self._handle_tool_calls(node, ctx, email)
-            logger.debug(f"[STREAM:{email}] ToolCalls done, buffer reset")
-            return "", False  # Reset buffer après tool call
-
+            handler = self._on_call_tools
         elif Agent.is_end_node(node):
-            logger.debug(f"[STREAM:{email}] EndNode reached")
-            return buffer, True
-
-        logger.debug(f"[STREAM:{email}] Unknown node type: {node_type}")
-        return buffer, False
+            handler = self._on_end
+        else:
+            handler = self._on_unknown
+        self._dispatch[type(node)] = handler
+        return handler
+
+    async def _on_model_request(self, node, ctx, email: str, buffer_parts: list[str]) -> bool:
+        await self._handle_model_request(node, ctx, email, buffer_parts)
+        logger.debug("[STREAM:%s] ModelRequest done, buffer_parts=%d", email, len(buffer_parts))
+        return False
+
+    async def _on_call_tools(self, node, ctx, email: str, buffer_parts: list[str]) -> bool:
+        await self._handle_tool_calls(node, ctx, email)
+        buffer_parts.clear()  # Reset buffer après tool call
+        logger.debug("[STREAM:%s] ToolCalls done, buffer reset", email)
+        return False
+
+    async def _on_end(self, node, ctx, email: str, buffer_parts: list[str]) -> bool:
+        logger.debug("[STREAM:%s] EndNode reached", email)
+        return True
+
+    async def _on_unknown(self, node, ctx, email: str, buffer_parts: list[str]) -> bool:
+        logger.debug("[STREAM:%s] Unknown node type: %s", email, type(node).__name__)
+        return False
 
     async def _handle_model_request(
-        self, node, ctx, email: str, buffer: str
-    ) -> str:
-        """Stream thinking/text et retourne le buffer mis à jour."""
+        self, node, ctx, email: str, buffer_parts: list[str]
+    ) -> None:
+        """Stream thinking/text et ajoute le texte à buffer_parts."""
         event_count = 0
-        async with node.stream(ctx) as stream:
-            async for event in stream:
-                event_count += 1
-                content = self._parser.extract_content(event)
-                if content:
-                    if self._parser.is_text_event(event):
-                        buffer += content
-                    await self._messaging.publish_event(
-                        email, SSEEventType.THINKING, {"content": content}
-                    )
-        logger.debug(f"[STREAM:{email}] ModelRequest stream finished, {event_count} events processed")
-        return buffer
+        coalescer = _DeltaCoalescer(
+            lambda content: self._messaging.publish_serialized(
+                email,
+                self._THINKING_PREFIX + orjson.dumps(content) + self._THINKING_SUFFIX,
+            )
+        )
+        try:
+            async with node.stream(ctx) as stream:
+                async for event in stream:
+                    event_count += 1
+                    kind, content = self._parser.classify(event)
+                    if content:
+                        if kind is SSEEventType.TEXT:
+                            buffer_parts.append(content)
+                        await coalescer.add(content)
+        finally:
+            await coalescer.aclose()
+        logger.debug("[STREAM:%s] ModelRequest stream finished, %d events processed", email, event_count)
 
     async def _handle_tool_calls(self, node, ctx, email: str):
         """Publie les tool calls et notifie le manager des visualisations."""
         async with node.stream(ctx) as stream:
             async for event in stream:
-                if isinstance(event, FunctionToolCallEvent):
-                    tool_name = event.part.tool_name
-                    logger.debug(f"[STREAM:{email}] ToolCall START: {tool_name}")
-                    await self._messaging.publish_event(
-                        email,
-                        SSEEventType.TOOL_CALL_START,
-                        {"name": tool_name, "args": event.part.args},
-                    )
-                elif isinstance(event, FunctionToolResultEvent):
-                    parsed = self._parser.parse_tool_result(event)
-                    logger.debug(
-                        f"[STREAM:{email}] ToolCall RESULT: type={parsed.event_type.value}"
-                    )
-                    # Notifier le manager si visualisation produite
-                    if parsed.event_type in (SSEEventType.PLOTLY, SSEEventType.DATA_TABLE):
-                        logger.debug(f"[STREAM:{email}] Visual output detected!")
-                        self._retry_manager.record_visual(email)
-                    await self._messaging.publish_event(
-                        email, parsed.event_type, parsed.data
-                    )
+                # Types feuilles : lookup exact plutôt qu'une chaîne d'isinstance
+                handler = self._tool_handlers.get(type(event))
+                if handler is not None:
+                    await handler(event, email)
+
+    async def _on_tool_call(self, event: FunctionToolCallEvent, email: str) -> None:
+        tool_name = event.part.tool_name
+        logger.debug("[STREAM:%s] ToolCall START: %s", email, tool_name)
+        await self._messaging.publish_event(
+            email,
+            SSEEventType.TOOL_CALL_START,
+            {"name": tool_name, "args": event.part.args},
+        )
+
+    async def _on_tool_result(self, event: FunctionToolResultEvent, email: str) -> None:
+        parsed = self._parser.parse_tool_result(event)
+        logger.debug(
+            "[STREAM:%s] ToolCall RESULT: type=%s", email, parsed.event_type.value
+        )
+        # Notifier le manager si visualisation produite
+        if parsed.event_type in (SSEEventType.PLOTLY, SSEEventType.DATA_TABLE):
+            logger.debug("[STREAM:%s] Visual output detected!", email)
+            self._retry_manager.record_visual(email)
+        if parsed.raw_json is not None:
+            await self._messaging.publish_raw_event(
+                email, parsed.event_type, parsed.raw_json
+            )
+        else:
+            await self._messaging.publish_event(
+                email, parsed.event_type, parsed.data
+            )
 
     async def publish_error(self, email: str, error: str):
         """Publie une erreur et termine le stream."""
-        logger.debug(f"[STREAM:{email}] Publishing error: {error}")
+        logger.debug("[STREAM:%s] Publishing error: %s", email, error)
         await self._messaging.publish_event(
             email, SSEEventType.ERROR, {"message": error}, done=True
         )
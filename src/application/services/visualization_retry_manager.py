@@ -2,20 +2,47 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import logging
-from dataclasses import dataclass, field
+import re
+from collections.abc import Sequence
+from dataclasses import dataclass
 from typing import Protocol
 
+from cachetools import TTLCache
 from pydantic_ai import Agent
-from pydantic_ai.messages import ModelMessage
+from pydantic_ai.messages import (
+    ModelMessage,
+    ModelRequest,
+    ModelResponse,
+    ToolCallPart,
+    UserPromptPart,
+)
 
 from src.application.services.messaging_service import MessagingService
+from src.config import settings
 from src.domain.enums import SSEEventType
+from src.domain.ports.judge_cache_port import JudgeCache
 
 logger = logging.getLogger(__name__)
 
 RETRY_PROMPT = "Crée une visualisation (graphique ou tableau) pour illustrer ta réponse précédente."
 MAX_RETRIES = 2
+# Borne des états de retry : une requête abandonnée ne fuit pas indéfiniment
+STATE_MAX = 10_000
+STATE_TTL_S = 600
+
+# Pré-filtre : une réponse courte sans chiffres, tableau ni vocabulaire
+# de visualisation ne justifie pas d'appel au judge
+PREFILTER_MAX_LEN = 80
+_NUM_RE = re.compile(r"\d[\d,.\s]{2,}")
+_TABLE_RE = re.compile(r"\|.*\|")
+_VIZ_KEYWORDS = frozenset({
+    "graphique", "tableau", "courbe", "diagramme", "histogramme",
+    "évolution", "répartition", "tendance", "comparer", "comparaison",
+    "visualis",
+})
 ERROR_MESSAGE = (
     "La visualisation n'a pas pu être générée. "
     "Pourriez-vous reformuler votre question ?"
@@ -46,7 +73,7 @@ class RunProtocol(Protocol):
         ...
 
 
-@dataclass
+@dataclass(slots=True)
 class RetryState:
     """État de retry pour un utilisateur."""
 
@@ -61,12 +88,63 @@ class RetryState:
         self.has_visual = True
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RetryDecision:
     """Paramètres pour le prochain retry."""
 
     retry_prompt: str
-    message_history: list[ModelMessage] = field(default_factory=list)
+    message_history: Sequence[ModelMessage] = ()
+
+
+def _obviously_no_viz(output: object) -> bool:
+    """True si la réponse est assez courte et neutre pour se passer du judge."""
+    if not isinstance(output, str) or not output or len(output) >= PREFILTER_MAX_LEN:
+        return False
+    if _NUM_RE.search(output) or _TABLE_RE.search(output):
+        return False
+    lowered = output.lower()
+    return not any(keyword in lowered for keyword in _VIZ_KEYWORDS)
+
+
+def _judge_key(messages: Sequence[ModelMessage]) -> str:
+    """
+    Empreinte d'un run pour le cache du judge.
+
+    Combine la question initiale de l'utilisateur (pas le prompt de retry)
+    et la séquence des outils appelés.
+    """
+    question = None
+    tools: list[str] = []
+    for message in messages:
+        if isinstance(message, ModelRequest):
+            if question is None:
+                question = next(
+                    (part.content for part in message.parts if isinstance(part, UserPromptPart)),
+                    None,
+                )
+        elif isinstance(message, ModelResponse):
+            tools.extend(part.tool_name for part in message.parts if isinstance(part, ToolCallPart))
+
+    key_text = f"{question}\x00{','.join(tools)}"
+    return hashlib.sha256(key_text.encode("utf-8")).hexdigest()
+
+
+class _RetryStateCache(TTLCache):
+    """TTLCache qui compte les états évincés (taille ou expiration)."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self.evicted = 0
+
+    def popitem(self):
+        item = super().popitem()
+        self.evicted += 1
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time) or ()
+        self.evicted += len(expired)
+        return expired
 
 
 # =============================================================================
@@ -86,28 +164,53 @@ class VisualizationRetryManager:
         self,
         messaging: MessagingService,
         judge_agent: Agent,
+        judge_cache: JudgeCache,
     ):
         self._messaging = messaging
         self._judge = judge_agent
-        self._states: dict[str, RetryState] = {}
+        self._judge_cache = judge_cache
+        self._prefilter_checks = 0
+        self._prefilter_hits = 0
+        # Pas de verrou : mutations uniquement depuis la boucle asyncio
+        self._states: _RetryStateCache = _RetryStateCache(STATE_MAX, STATE_TTL_S)
+
+    @property
+    def states_evicted(self) -> int:
+        """Nombre d'états évincés sans _reset (requêtes abandonnées)."""
+        return self._states.evicted
+
+    @property
+    def prefilter_hit_rate(self) -> float:
+        """Part des évaluations tranchées par le pré-filtre, sans judge."""
+        if not self._prefilter_checks:
+            return 0.0
+        return self._prefilter_hits / self._prefilter_checks
 
     def start_request(self, email: str) -> None:
         """Initialise l'état pour une nouvelle requête."""
         self._states[email] = RetryState()
-        logger.debug(f"[RETRY:{email}] Request started")
+        logger.debug("[RETRY:%s] Request started", email)
+
+    def end_request(self, email: str) -> None:
+        """Libère l'état de la requête, quelle que soit son issue."""
+        self._reset(email)
 
     def record_visual(self, email: str) -> None:
         """Enregistre qu'une visualisation a été produite."""
         if state := self._states.get(email):
             state.mark_visual()
-            logger.debug(f"[RETRY:{email}] Visual recorded")
+            logger.debug("[RETRY:%s] Visual recorded", email)
 
     async def finalize_or_retry(
-        self, email: str, run: RunProtocol, buffer: str
+        self, email: str, run: RunProtocol, buffer_parts: list[str]
     ) -> RetryDecision | None:
         """
         Évalue et finalise le run, ou retourne les paramètres de retry.
 
+        Args:
+            buffer_parts: Fragments de texte streamés, joints une seule fois
+                si la sortie du run est vide.
+
         Returns:
             None si finalisé (succès ou échec), RetryDecision si retry nécessaire.
         """
@@ -115,62 +218,86 @@ class VisualizationRetryManager:
 
         # Pas d'état → finaliser directement
         if not state:
-            logger.debug(f"[RETRY:{email}] No state, finalizing")
-            await self._publish_final(email, run, buffer)
+            logger.debug("[RETRY:%s] No state, finalizing", email)
+            await self._publish_final(email, run, buffer_parts)
             return None
 
         # Fast path: visualisation produite → succès
         if state.has_visual:
-            logger.debug(f"[RETRY:{email}] SUCCESS: visual produced")
+            logger.debug("[RETRY:%s] SUCCESS: visual produced", email)
             self._reset(email)
-            await self._publish_final(email, run, buffer)
+            await self._publish_final(email, run, buffer_parts)
             return None
 
         # Max retries atteint → erreur
         if state.attempt >= MAX_RETRIES:
             logger.warning(f"[RETRY:{email}] FAILED: max retries reached")
             self._reset(email)
-            await self._publish_final(email, run, buffer, error_message=ERROR_MESSAGE)
+            await self._publish_final(email, run, buffer_parts, error_message=ERROR_MESSAGE)
             return None
 
+        # Historique construit une seule fois : judge et retry partagent la liste
+        messages = run.result.all_messages()
+
         # Évaluer via judge agent
-        needs_viz = await self._evaluate_need(email, run)
+        needs_viz = await self._evaluate_need(email, run.result.output, messages)
 
         # Pas besoin de visualisation → succès
         if not needs_viz:
-            logger.debug(f"[RETRY:{email}] No visualization needed")
+            logger.debug("[RETRY:%s] No visualization needed", email)
             self._reset(email)
-            await self._publish_final(email, run, buffer)
+            await self._publish_final(email, run, buffer_parts)
             return None
 
         # Retry nécessaire
-        return await self._trigger_retry(email, run, state)
+        return await self._trigger_retry(email, messages, state)
 
     # -------------------------------------------------------------------------
     # HELPERS PRIVÉS
     # -------------------------------------------------------------------------
 
-    async def _evaluate_need(self, email: str, run: RunProtocol) -> bool:
-        """Appelle le judge agent pour évaluer le besoin de visualisation."""
+    async def _evaluate_need(
+        self, email: str, output: str | None, messages: Sequence[ModelMessage]
+    ) -> bool:
+        """Appelle le judge agent (sauf pré-filtre ou cache) pour évaluer le besoin de visualisation."""
+        self._prefilter_checks += 1
+        if _obviously_no_viz(output):
+            self._prefilter_hits += 1
+            logger.debug("[RETRY:%s] Pre-filter: no visualization needed", email)
+            return False
+
+        key = _judge_key(messages)
+
+        cached = await self._judge_cache.get(key)
+        if cached is not None:
+            logger.debug("[RETRY:%s] Judge (cache): needs_viz=%s", email, cached)
+            return cached
+
         try:
-            judgment = await self._judge.run(
-                "La réponse nécessitait-elle une visualisation ?",
-                message_history=run.result.all_messages(),
+            judgment = await asyncio.wait_for(
+                self._judge.run(
+                    "La réponse nécessitait-elle une visualisation ?",
+                    message_history=messages,
+                ),
+                settings.JUDGE_TIMEOUT,  # None : pas de limite
             )
-            needs_viz = judgment.output.needs_visualization
-            logger.debug(f"[RETRY:{email}] Judge: needs_viz={needs_viz}")
-            return needs_viz
         except Exception as e:
-            logger.warning(f"[RETRY:{email}] Judge failed: {e}, defaulting to True")
+            # Timeout (opt-in via JUDGE_TIMEOUT) traité comme tout autre échec
+            logger.warning("[RETRY:%s] Judge failed: %r, defaulting to True", email, e)
             return True
 
+        needs_viz = judgment.output.needs_visualization
+        logger.debug("[RETRY:%s] Judge: needs_viz=%s", email, needs_viz)
+        await self._judge_cache.set(key, needs_viz)
+        return needs_viz
+
     async def _trigger_retry(
-        self, email: str, run: RunProtocol, state: RetryState
+        self, email: str, messages: Sequence[ModelMessage], state: RetryState
     ) -> RetryDecision:
         """Déclenche un retry."""
         state.increment_attempt()
 
-        logger.info(f"[RETRY:{email}] Retry {state.attempt}/{MAX_RETRIES}")
+        logger.info("[RETRY:%s] Retry %d/%d", email, state.attempt, MAX_RETRIES)
 
         await self._messaging.publish_event(
             email,
@@ -180,17 +307,17 @@ class VisualizationRetryManager:
 
         return RetryDecision(
             retry_prompt=RETRY_PROMPT,
-            message_history=run.result.all_messages(),
+            message_history=messages,
         )
 
     async def _publish_final(
-        self, email: str, run: RunProtocol, buffer: str, error_message: str | None = None
+        self, email: str, run: RunProtocol, buffer_parts: list[str], error_message: str | None = None
     ) -> None:
         """Publie le texte final et DONE (ou ERROR si error_message)."""
-        final_response = run.result.output if run.result.output else buffer.strip()
+        final_response = run.result.output or "".join(buffer_parts).strip()
 
         if error_message:
-            logger.debug(f"[RETRY:{email}] Publishing error: {error_message}")
+            logger.debug("[RETRY:%s] Publishing error: %s", email, error_message)
             await self._messaging.publish_event(
                 email,
                 SSEEventType.ERROR,
@@ -198,12 +325,7 @@ class VisualizationRetryManager:
                 done=True,
             )
         else:
-            response_preview = (
-                final_response[:100] + "..."
-                if len(final_response) > 100
-                else final_response
-            )
-            logger.debug(f"[RETRY:{email}] Publishing final: {response_preview!r}")
+            logger.debug("[RETRY:%s] Publishing final: %.100r", email, final_response)
             if final_response.strip():
                 await self._messaging.publish_event(
                     email, SSEEventType.TEXT, {"content": final_response}
@@ -212,9 +334,9 @@ class VisualizationRetryManager:
                 email, SSEEventType.DONE, {}, done=True
             )
 
-        logger.debug(f"[RETRY:{email}] Stream completed")
+        logger.debug("[RETRY:%s] Stream completed", email)
 
     def _reset(self, email: str) -> None:
         """Supprime l'état pour cet email."""
         self._states.pop(email, None)
-        logger.debug(f"[RETRY:{email}] State reset")
+        logger.debug("[RETRY:%s] State reset", email)
@@ -6,6 +6,7 @@ une interface unique pour acceder a la configuration.
 """
 
 import os
+from typing import Optional
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -16,7 +17,20 @@ class Settings:
 
     # === CONFIGURATION MESSAGING ===
     CHANNEL_TYPE: str = os.getenv("CHANNEL_TYPE", "redis")  # "redis" ou "memory"
-    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")
+    REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379")  # Redis ou compatible (DragonflyDB)
+    REDIS_MAX_CONNECTIONS: int = int(os.getenv("REDIS_MAX_CONNECTIONS", "64"))
+
+    # === CONFIGURATION AGENT ===
+    AGENT_MAX_CONCURRENCY: int = int(os.getenv("AGENT_MAX_CONCURRENCY", "8"))  # Workers (requetes en parallele)
+    AGENT_QUEUE_SIZE: int = int(os.getenv("AGENT_QUEUE_SIZE", "256"))  # Requetes en attente max
+    AGENT_PREWARM: bool = os.getenv("AGENT_PREWARM", "false").lower() == "true"  # Run "ping" au demarrage
+    JUDGE_CACHE_TTL: int = int(os.getenv("JUDGE_CACHE_TTL", "3600"))  # Duree de vie d'un verdict du judge (s)
+    JUDGE_TIMEOUT: Optional[float] = (  # Delai max du judge (s), non defini = pas de limite
+        float(os.environ["JUDGE_TIMEOUT"]) if os.getenv("JUDGE_TIMEOUT") else None
+    )
+
+    # === CONFIGURATION LOGGING ===
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()  # DEBUG via --verbose
 
 
 # Instance globale pour import facile
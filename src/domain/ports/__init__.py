@@ -3,5 +3,6 @@ Ports (Interfaces) - Contrats que les adapters doivent implementer.
 """
 
 from src.domain.ports.message_channel_port import MessageChannel, Message
+from src.domain.ports.judge_cache_port import JudgeCache
 
-__all__ = ["MessageChannel", "Message"]
+__all__ = ["MessageChannel", "Message", "JudgeCache"]
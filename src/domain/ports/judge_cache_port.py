@@ -0,0 +1,46 @@
+"""
+Port (Interface) pour le cache des verdicts du judge agent.
+
+Evite un appel LLM quand la meme question a deja ete jugee
+avec la meme sequence d'outils.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class JudgeCache(ABC):
+    """
+    Interface abstraite pour un cache de verdicts (needs_visualization).
+
+    Implementations possibles:
+    - RedisJudgeCache (partage entre processus, expiration Redis)
+    - InMemoryJudgeCache (TTLCache local, pour tests/dev)
+
+    Le cache est best-effort : une erreur du backend doit se traduire
+    par un miss, jamais par une exception.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bool]:
+        """
+        Retourne le verdict en cache.
+
+        Args:
+            key: Cle du verdict (empreinte question + outils)
+
+        Returns:
+            Le verdict, ou None si absent
+        """
+        pass
+
+    @abstractmethod
+    async def set(self, key: str, verdict: bool) -> None:
+        """
+        Enregistre un verdict.
+
+        Args:
+            key: Cle du verdict (empreinte question + outils)
+            verdict: True si une visualisation etait necessaire
+        """
+        pass
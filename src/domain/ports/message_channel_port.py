@@ -7,7 +7,7 @@ de canaux doivent respecter (Redis, In-Memory, Kafka, etc.).
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import AsyncIterator, Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Sequence
 
 
 @dataclass
@@ -67,6 +67,21 @@ class MessageChannel(ABC):
         """
         pass
 
+    @abstractmethod
+    async def publish_many(self, messages: Sequence[tuple[str, bytes]]) -> None:
+        """
+        Publie plusieurs messages deja serialises en un seul aller-retour.
+
+        L'ordre des messages doit etre preserve (meme ordre que la sequence).
+
+        Args:
+            messages: Couples (canal, document JSON encode en UTF-8)
+
+        Raises:
+            ConnectionError: Si le canal n'est pas connecte
+        """
+        pass
+
     @abstractmethod
     async def subscribe(self, pattern: str) -> None:
         """
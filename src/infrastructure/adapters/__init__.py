@@ -4,8 +4,12 @@ Adapters - Implementations concretes des ports.
 
 from src.infrastructure.adapters.redis_channel_adapter import RedisMessageChannel
 from src.infrastructure.adapters.memory_channel_adapter import InMemoryMessageChannel
+from src.infrastructure.adapters.redis_judge_cache_adapter import RedisJudgeCache
+from src.infrastructure.adapters.memory_judge_cache_adapter import InMemoryJudgeCache
 
 __all__ = [
     "RedisMessageChannel",
     "InMemoryMessageChannel",
+    "RedisJudgeCache",
+    "InMemoryJudgeCache",
 ]
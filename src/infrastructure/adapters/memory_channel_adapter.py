@@ -7,7 +7,9 @@ Utile pour les tests unitaires et le developpement sans Redis.
 import asyncio
 import fnmatch
 import logging
-from typing import AsyncIterator, Dict, Any, List
+from typing import AsyncIterator, Dict, Any, List, Sequence
+
+import orjson
 
 from src.domain.ports.message_channel_port import Message, MessageChannel
 
@@ -76,6 +78,18 @@ class InMemoryMessageChannel(MessageChannel):
                 await self._queue.put(msg)
                 return
 
+    async def publish_many(self, messages: Sequence[tuple[str, bytes]]) -> None:
+        """
+        Publie un lot de payloads JSON, dans l'ordre.
+
+        En memoire les consommateurs attendent un dict : chaque payload est decode.
+
+        Args:
+            messages: Couples (canal, document JSON encode en UTF-8)
+        """
+        for channel, payload in messages:
+            await self.publish(channel, orjson.loads(payload))
+
     async def subscribe(self, pattern: str) -> None:
         """
         S'abonne a un pattern de canaux.
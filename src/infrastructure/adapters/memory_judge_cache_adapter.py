@@ -0,0 +1,32 @@
+"""
+Adapter In-Memory du cache des verdicts du judge agent.
+
+Utile pour les tests unitaires et le developpement sans Redis.
+"""
+
+from typing import Optional
+
+from cachetools import TTLCache
+
+from src.domain.ports.judge_cache_port import JudgeCache
+
+
+class InMemoryJudgeCache(JudgeCache):
+    """
+    Cache de verdicts local au processus, borne en taille et en duree.
+
+    Args:
+        maxsize: Nombre maximal de verdicts conserves
+        ttl: Duree de vie d'un verdict en secondes
+    """
+
+    def __init__(self, maxsize: int = 10_000, ttl: int = 3600):
+        self._verdicts: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    async def get(self, key: str) -> Optional[bool]:
+        """Retourne le verdict en cache, None si absent ou expire."""
+        return self._verdicts.get(key)
+
+    async def set(self, key: str, verdict: bool) -> None:
+        """Enregistre le verdict."""
+        self._verdicts[key] = verdict
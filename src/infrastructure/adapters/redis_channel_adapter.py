@@ -4,10 +4,10 @@ Adapter Redis du canal de messaging.
 Utilise redis.asyncio pour une communication Pub/Sub asynchrone.
 """
 
-import json
 import logging
-from typing import AsyncIterator, Dict, Any, Optional
+from typing import AsyncIterator, Dict, Any, Optional, Sequence
 
+import orjson
 import redis.asyncio as redis
 
 from src.domain.ports.message_channel_port import Message, MessageChannel
@@ -22,12 +22,16 @@ class RedisMessageChannel(MessageChannel):
     Cette implementation permet la communication entre plusieurs
     processus/services via Redis.
 
+    L'URL peut aussi pointer vers un serveur compatible (ex: DragonflyDB).
+
     Args:
         url: URL de connexion Redis (ex: "redis://localhost:6379")
+        max_connections: Taille max du pool de connexions (None = illimite)
     """
 
-    def __init__(self, url: str = "redis://localhost:6379"):
+    def __init__(self, url: str = "redis://localhost:6379", max_connections: Optional[int] = None):
         self.url = url
+        self.max_connections = max_connections
         self._redis: Optional[redis.Redis] = None
         self._pubsub: Optional[redis.client.PubSub] = None
         self._subscribed = False
@@ -38,7 +42,7 @@ class RedisMessageChannel(MessageChannel):
             return
 
         try:
-            self._redis = redis.from_url(self.url)
+            self._redis = redis.from_url(self.url, max_connections=self.max_connections)
             await self._redis.ping()
             logger.info(f"Connecte a Redis: {self.url}")
         except redis.ConnectionError as e:
@@ -74,9 +78,24 @@ class RedisMessageChannel(MessageChannel):
         if self._redis is None:
             raise ConnectionError("Canal non connecte. Appelez connect() d'abord.")
 
-        payload = json.dumps(message)
+        payload = orjson.dumps(message)
         await self._redis.publish(channel, payload)
 
+    async def publish_many(self, messages: Sequence[tuple[str, bytes]]) -> None:
+        """
+        Publie un lot de payloads JSON via un pipeline Redis (sans MULTI).
+
+        Args:
+            messages: Couples (canal, document JSON encode en UTF-8)
+        """
+        if self._redis is None:
+            raise ConnectionError("Canal non connecte. Appelez connect() d'abord.")
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for channel, payload in messages:
+                pipe.publish(channel, payload)
+            await pipe.execute()
+
     async def subscribe(self, pattern: str) -> None:
         """
         S'abonne a un pattern de canaux Redis.
@@ -110,13 +129,14 @@ class RedisMessageChannel(MessageChannel):
                         channel = channel.decode("utf-8")
 
                     data_raw = raw_message["data"]
-                    if isinstance(data_raw, bytes):
-                        data_raw = data_raw.decode("utf-8")
 
-                    # Tente de parser en JSON, sinon wrap comme signal
+                    # Tente de parser en JSON (orjson lit les bytes directement),
+                    # sinon wrap comme signal
                     try:
-                        data = json.loads(data_raw)
-                    except json.JSONDecodeError:
+                        data = orjson.loads(data_raw)
+                    except orjson.JSONDecodeError:
+                        if isinstance(data_raw, bytes):
+                            data_raw = data_raw.decode("utf-8")
                         data = {"signal": data_raw}
 
                     pattern = raw_message.get("pattern")
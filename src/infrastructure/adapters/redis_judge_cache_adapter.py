@@ -0,0 +1,55 @@
+"""
+Adapter Redis du cache des verdicts du judge agent.
+"""
+
+import logging
+from typing import Optional
+
+import redis.asyncio as redis
+
+from src.domain.ports.judge_cache_port import JudgeCache
+
+logger = logging.getLogger(__name__)
+
+
+class RedisJudgeCache(JudgeCache):
+    """
+    Cache de verdicts stocke dans Redis (SET key verdict EX ttl).
+
+    Le client est cree au premier appel ; redis.asyncio ouvre ses
+    connexions a la demande.
+
+    Args:
+        url: URL de connexion Redis (ex: "redis://localhost:6379")
+        ttl: Duree de vie d'un verdict en secondes
+        prefix: Prefixe des cles Redis
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379", ttl: int = 3600, prefix: str = "judge:"):
+        self.url = url
+        self.ttl = ttl
+        self.prefix = prefix
+        self._redis: Optional[redis.Redis] = None
+
+    def _client(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.from_url(self.url)
+        return self._redis
+
+    async def get(self, key: str) -> Optional[bool]:
+        """Retourne le verdict en cache, None si absent ou si Redis echoue."""
+        try:
+            value = await self._client().get(f"{self.prefix}{key}")
+        except redis.RedisError as e:
+            logger.warning(f"Lecture du cache judge impossible: {e}")
+            return None
+        if value is None:
+            return None
+        return value == b"1"
+
+    async def set(self, key: str, verdict: bool) -> None:
+        """Enregistre le verdict avec expiration."""
+        try:
+            await self._client().set(f"{self.prefix}{key}", b"1" if verdict else b"0", ex=self.ttl)
+        except redis.RedisError as e:
+            logger.warning(f"Ecriture du cache judge impossible: {e}")
@@ -11,6 +11,8 @@ from dependency_injector import containers, providers
 from src.config import settings
 from src.infrastructure.adapters.redis_channel_adapter import RedisMessageChannel
 from src.infrastructure.adapters.memory_channel_adapter import InMemoryMessageChannel
+from src.infrastructure.adapters.redis_judge_cache_adapter import RedisJudgeCache
+from src.infrastructure.adapters.memory_judge_cache_adapter import InMemoryJudgeCache
 from src.application.services.messaging_service import MessagingService
 from src.application.services.cancellation_manager import CancellationManager
 from src.application.services.dataset_loader import DatasetLoader
@@ -50,6 +52,7 @@ class Container(containers.DeclarativeContainer):
     redis_channel = providers.Singleton(
         RedisMessageChannel,
         url=settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
     )
     """Canal Redis (Singleton)."""
 
@@ -82,6 +85,7 @@ class Container(containers.DeclarativeContainer):
     cancellation_redis_channel = providers.Singleton(
         RedisMessageChannel,
         url=settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
     )
     """Canal Redis dédié pour la cancellation (séparé du messaging)."""
 
@@ -118,10 +122,22 @@ class Container(containers.DeclarativeContainer):
     judge_agent = providers.Singleton(create_judge_agent)
     """Agent judge pour évaluer le besoin de visualisation."""
 
+    judge_cache = providers.Selector(
+        config.channel_type,
+        redis=providers.Singleton(
+            RedisJudgeCache,
+            url=settings.REDIS_URL,
+            ttl=settings.JUDGE_CACHE_TTL,
+        ),
+        memory=providers.Singleton(InMemoryJudgeCache, ttl=settings.JUDGE_CACHE_TTL),
+    )
+    """Cache des verdicts du judge (Redis partagé ou local)."""
+
     retry_manager = providers.Singleton(
         VisualizationRetryManager,
         messaging=messaging_service,
         judge_agent=judge_agent,
+        judge_cache=judge_cache,
     )
     """Manager singleton pour les retries de visualisation."""
 